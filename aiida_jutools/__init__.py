@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-# pylint: disable=unused-import
 ###############################################################################
 # Copyright (c), Forschungszentrum Jülich GmbH, IAS-1/PGI-1, Germany.         #
 #                All rights reserved.                                         #
@@ -15,24 +14,72 @@
 
 We recommended to use this library with the import statement ``import aiida_jutools as jutools``. In your code,
 you can then call all available tools like so: ``jutools.package.tool()``.
+
+The library's packages are loaded lazily (PEP 562): ``import aiida_jutools`` itself is cheap, and a package like
+``jutools.computer`` -- along with its transitive AiiDA / plugin dependencies -- only gets imported on first
+attribute access. The public names are declared eagerly under ``typing.TYPE_CHECKING`` below, so IDEs and static
+type checkers see the full API regardless.
 """
 __version__ = "0.1.0-dev1"
 
-# Import all of the library's user packages.
-from . import code
-from . import computer
-from . import group
-from . import io
-from . import logging
-from . import meta
-from . import node
-from . import plugins
-from . import process
-from . import process_functions
-from . import submit
-from . import structure
-# # import all of the library's developer packages.
-from . import _dev
+import importlib as _importlib
+import sys as _sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Eager imports for static analyzers and IDE autocomplete only; this branch is false at runtime.
+    # Import all of the library's user packages.
+    from . import code
+    from . import computer
+    from . import group
+    from . import io
+    from . import logging
+    from . import meta
+    from . import node
+    from . import plugins
+    from . import process
+    from . import process_functions
+    from . import submit
+    from . import structure
+    # Import all of the library's developer packages.
+    from . import _dev
+
+# All of the library's user packages, plus the developer package '_dev'.
+_LAZY_PACKAGES = frozenset({
+    "code",
+    "computer",
+    "group",
+    "io",
+    "logging",
+    "meta",
+    "node",
+    "plugins",
+    "process",
+    "process_functions",
+    "submit",
+    "structure",
+    "_dev",
+})
+
+__all__ = sorted(name for name in _LAZY_PACKAGES if not name.startswith("_"))
+
+if _sys.version_info >= (3, 15):
+    # PEP 810: the interpreter handles the laziness natively on 3.15+; the __getattr__ below then only
+    # serves interpreters without native support. No star imports anywhere -- they would defeat the mechanism.
+    __lazy_modules__ = [f"{__name__}.{name}" for name in sorted(_LAZY_PACKAGES)]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PACKAGES:
+        module = _importlib.import_module(f".{name}", __name__)
+        # Cache the resolved package so subsequent accesses are plain dict lookups.
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_PACKAGES)
 
 # Potentially problematic imports:
 # - kkr: As soon as aiida-kkr becomes dependent on aiida-jutools, this import MIGHT introduce a circular
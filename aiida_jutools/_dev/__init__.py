@@ -13,6 +13,9 @@
 ###############################################################################
 """AiiDA-JuTools: dev tools. Non-public (prefix with ``_``)."""
 
+from .import_time import \
+    check_import_time
+
 from .periodic_tables import \
     minimal_periodic_table
 
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+# Copyright (c), Forschungszentrum Jülich GmbH, IAS-1/PGI-1, Germany.         #
+#                All rights reserved.                                         #
+# This file is part of the aiida-jutools package.                             #
+# (AiiDA JuDFT tools)                                                         #
+#                                                                             #
+# The code is hosted on GitHub at https://github.com/judftteam/aiida-jutools. #
+# For further information on the license, see the LICENSE.txt file.           #
+# For further information please visit http://judft.de/.                      #
+#                                                                             #
+###############################################################################
+"""Regression guard for the lazy-loading import time of :py:mod:`aiida_jutools`.
+
+Call :py:func:`check_import_time` from CI (or by hand) after changes to the package's import machinery.
+It fails if a bare ``import aiida_jutools`` got slow again or started eagerly pulling in heavy dependencies.
+"""
+
+import statistics as _statistics
+import subprocess as _subprocess
+import sys as _sys
+import time as _time
+import typing as _typing
+
+# Single knob for the CI guard; tighten as further lazy-loading work lands.
+IMPORT_TIME_THRESHOLD_SECONDS: float = 0.05
+
+# Heavy modules that a bare 'import aiida_jutools' must NOT load eagerly.
+HEAVY_MODULES: _typing.Tuple[str, ...] = ("numpy", "pandas", "aiida.orm", "plumpy", "matplotlib")
+
+
+def check_import_time(threshold: float = IMPORT_TIME_THRESHOLD_SECONDS,
+                      num_runs: int = 5) -> float:
+    """Check that a bare ``import aiida_jutools`` is fast and does not load heavy dependencies.
+
+    Each measurement runs in a fresh interpreter so the import is genuinely cold.
+
+    :param threshold: maximum allowed median cold-import time in seconds.
+    :param num_runs: number of cold runs to take the median over.
+    :return: the measured median cold-import time in seconds.
+    :raise RuntimeError: if a heavy module gets imported eagerly, or the median import time exceeds the threshold.
+    """
+    # guard 1: no heavy module may appear in sys.modules after the bare import.
+    check_no_heavy = ("import sys, aiida_jutools; "
+                      f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]; "
+                      "assert not loaded, f'eagerly imported: {loaded}'")
+    result = _subprocess.run([_sys.executable, "-c", check_no_heavy],
+                             capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'import aiida_jutools' eagerly imports heavy modules:\n{result.stderr}")
+
+    # guard 2: median cold-import time must stay below the threshold.
+    times = []
+    for _ in range(num_runs):
+        start = _time.perf_counter()
+        _subprocess.run([_sys.executable, "-c", "import aiida_jutools"], check=True)
+        times.append(_time.perf_counter() - start)
+    # subtract interpreter startup, measured the same way with an empty program
+    startups = []
+    for _ in range(num_runs):
+        start = _time.perf_counter()
+        _subprocess.run([_sys.executable, "-c", ""], check=True)
+        startups.append(_time.perf_counter() - start)
+    median = _statistics.median(times) - _statistics.median(startups)
+
+    if median > threshold:
+        raise RuntimeError(f"'import aiida_jutools' median cold-import time {median * 1e3:.1f} ms exceeds "
+                           f"threshold {threshold * 1e3:.1f} ms. Run python -X importtime -c 'import aiida_jutools' "
+                           f"(and e.g. tuna on its log) to find the regression.")
+    return median
+
+
+if __name__ == "__main__":
+    print(f"median cold-import time: {check_import_time() * 1e3:.1f} ms")
@@ -16,13 +16,15 @@ import dataclasses as _dc
 import io as _io
 import typing as _typing
 
-import humanfriendly as _humanfriendly
-import pandas as _pd
 from aiida import orm as _orm
 from masci_tools.util import python_util as _masci_python_util
 
 import aiida_jutools as _jutools
 
+if _typing.TYPE_CHECKING:
+    # heavy deps used in single methods only; imported there function-locally at runtime
+    import pandas as _pd
+
 
 @_dc.dataclass
 class QuotaQuerierSettings:
@@ -59,9 +61,11 @@ class QuotaQuerier:
         self.computer = computer
         self.settings = settings
 
-    def get_quota(self) -> _pd.DataFrame:
+    def get_quota(self) -> '_pd.DataFrame':
         """Get quota as a pandas dataframe.
         """
+        import pandas as _pd
+
         s = self.settings
 
         exit_code, stdout, stderr = _jutools.computer.shell_command(computer=self.computer,
@@ -79,6 +83,8 @@ class QuotaQuerier:
 
         :return: True if used space > (hard limit - buffer) , False if not.
         """
+        import humanfriendly as _humanfriendly
+
         s = self.settings
 
         if not s.dirname_pattern or not s.min_free_space:
@@ -12,17 +12,117 @@
 ###############################################################################
 """Tools for managing AiiDA Computer options nodes."""
 
+import collections as _collections
 import dataclasses as _dc
+import hashlib as _hashlib
+import itertools as _itertools
+import json as _json
+import logging as _logging
 import re as _re
+import time as _time
 import typing as _typing
 
 import aiida as _aiida
 from aiida import orm as _orm, schedulers as _aiida_schedulers, engine as _aiida_engine, tools as _aiida_tools
-from aiida.schedulers.plugins import lsf as _aiida_lsf_schedulers, slurm as _aiida_slurm_schedulers
+from aiida.manage.manager import get_manager as _get_manager
+# DEVNOTE: the slurm plugin is referenced by the default-config factories (_build_*_config) of
+# ComputerOptionsManager. The lsf plugin is only needed in the get_help keywords fallback and is
+# imported there.
+from aiida.schedulers.plugins import slurm as _aiida_slurm_schedulers
 
 import aiida_jutools as _jutools
 from masci_tools.util import python_util as _masci_python_util
 
+# Short-lived cache for queue listings: get_queues() contacts the remote scheduler, by far the
+# slowest step of get_options' queue_name resolution, and the resolution loops may probe the same
+# computer repeatedly. Keyed by (computer uuid, gpu flag), entries expire after the TTL.
+_QUEUE_CACHE_TTL_SECONDS: float = 60.0
+_queue_cache: _typing.Dict[_typing.Tuple[str, _typing.Optional[bool]],
+                           _typing.Tuple[float, _typing.List[str]]] = {}
+
+
+_logger = _logging.getLogger(__name__)
+
+# options fields which are explicit named arguments of get_options rather than kwargs.
+# DEVNOTE: adjust this if the get_options signature changes! (ie if other options keywords are moved
+#          from kwargs to named method arguments). This affects also option query and creation sections.
+_EXPLICIT_ARG_KEYWORDS = frozenset({"withmpi", "queue_name", "account"})
+
+# level names as used by the _log methods below, mapped to stdlib logging levels
+_LOG_LEVELS = {"info": _logging.INFO, "warning": _logging.WARNING, "error": _logging.ERROR}
+
+# Tokenizer for decomposing config names into words (compiled once at import).
+_CONFNAME_TOKEN_RE = _re.compile(r"[a-zA-Z]+")
+
+# Batch size for IN-filters: stay well below the 65535 query parameter limit of psycopg,
+# which unbatched IN-filters can hit on large label/uuid lists.
+_FILTER_BATCH_SIZE: int = 999
+
+# 'resources' subfields which may clash if all three are defined (get_options validation).
+_CLASHABLE_SUBKEYS = frozenset({'num_machines', 'num_mpiprocs_per_machine', 'tot_num_mpiprocs'})
+
+# Spec-derived constants for get_help, introspected lazily and only once per process: the CalcJob
+# options keywords and their descriptions are fixed for a given aiida version.
+_ALL_OPTIONS_KEYS: _typing.Optional[_typing.List[str]] = None
+_ALL_DESCRIPTIONS: _typing.Optional[_typing.Dict[str, str]] = None
+
+
+def _get_spec_options_cached() -> _typing.Tuple[_typing.List[str], _typing.Dict[str, str]]:
+    """Sorted CalcJob options keywords and their descriptions, introspected once per process.
+
+    :return: tuple of sorted keywords list, keyword : description dict.
+    """
+    global _ALL_OPTIONS_KEYS, _ALL_DESCRIPTIONS
+    if _ALL_OPTIONS_KEYS is None:
+        _ALL_OPTIONS_KEYS = sorted(_aiida_engine.CalcJob.spec_options.keys())
+        _ALL_DESCRIPTIONS = _aiida_engine.CalcJob.spec_options.get_description()
+    return _ALL_OPTIONS_KEYS, _ALL_DESCRIPTIONS
+
+
+def _batch_iter(sequence: _typing.Sequence,
+                batch_size: int = _FILTER_BATCH_SIZE) -> _typing.Iterator[_typing.Sequence]:
+    """Yield consecutive slices of a sequence, for batching large IN-filters.
+
+    :param sequence: sequence to slice.
+    :param batch_size: maximum slice length.
+    :return: iterator over slices.
+    """
+    for start in range(0, len(sequence), batch_size):
+        yield sequence[start:start + batch_size]
+
+
+def _attributes_hash(attributes: dict) -> bytes:
+    """Canonical digest of a node's attributes dict, for O(1) matching instead of deep dict equality.
+
+    :param attributes: a node's attributes dict (may be nested).
+    :return: 16-byte digest of the canonically serialized dict.
+    """
+    serialized = _json.dumps(attributes, sort_keys=True, default=str).encode()
+    return _hashlib.blake2b(serialized, digest_size=16).digest()
+
+
+def _get_queues_cached(computer: _orm.Computer,
+                       gpu: bool = None,
+                       silent: bool = False) -> _typing.List[str]:
+    """Memoized wrapper around :py:func:`aiida_jutools.computer.get_queues` (names only).
+
+    :param computer: aiida computer.
+    :param gpu: False: exclude gpu queues. True: exclude non-gpu queues. None: ignore this option.
+    :param silent: True: do not print out any info.
+    :return: list of queue names, freshly queried or cached if younger than the TTL.
+    """
+    key = (computer.uuid, gpu)
+    now = _time.monotonic()
+    entry = _queue_cache.get(key)
+    if entry and (now - entry[0]) < _QUEUE_CACHE_TTL_SECONDS:
+        return entry[1]
+    queue_names = _jutools.computer.get_queues(computer=computer,
+                                               gpu=gpu,
+                                               with_node_count=False,
+                                               silent=silent)
+    _queue_cache[key] = (now, queue_names)
+    return queue_names
+
 
 @_dc.dataclass(init=True, repr=True, eq=True, order=False, frozen=False)
 class _OptionsQueryConfig:
@@ -122,6 +222,28 @@ class _OptionsConfig:
     def __post_init__(self, _silent: bool):
         self._is_initialized = False
 
+        # keyword caches for get_options kwarg validation, filled by initialize().
+        # get_help() introspects the CalcJob spec (and possibly computers) on every call,
+        # which is too expensive to redo per get_options() call.
+        self._cached_options_keys = None
+        self._cached_resources_keys = None
+        self._validate_resources = None
+
+        # instance cache for get_help's resources keys determination (may query computers/schedulers)
+        self._help_resources_keys = None
+
+        # dirty bit for the options property: only re-query the groups' option nodes after
+        # something changed (initialization, newly stored options, deletions).
+        self._options_dirty = True
+
+        # queue_name -> [attributes dict, ...] index over the config's option nodes, built lazily
+        # by _get_queue_index(). rebuilt alongside the options cache (None = stale).
+        self._queue_index = None
+
+        # cached group labels: reading .label per group object can hit the backend, and the label
+        # list is needed by every query. refreshed whenever _groups is consolidated (initialize).
+        self._group_labels = tuple(group.label for group in self._groups)
+
         # set group extras
         for group in self._groups:
             group.set_extra_many(self._group_extras)
@@ -129,6 +251,16 @@ class _OptionsConfig:
         # for defining internal keywords used by help method.
         self._help_config = _OptionsConfig._HelpConfig()
 
+        # dispatch table for resolving mandatory options fields in get_options
+        self._mandatory_handlers = {"queue_name": self._resolve_queue_name,
+                                    "account": self._resolve_account}
+
+        # dispatch table for the conditional creation-default attributes in get_options
+        self._conditional_handlers = {"withmpi": self._handle_withmpi}
+
+        # precompute filtered views of the creation defaults
+        self._refresh_creation_defaults()
+
         # DEVNOTE: one could use the defined default options to get a
         # default
 
@@ -139,15 +271,36 @@ class _OptionsConfig:
              func=None,
              msg: str = "",
              name: bool = True):
-        """Basic logging.
+        """Basic logging, deferred to :py:mod:`logging`.
 
-        TODO replace with real logging / aiida logging.
+        Message composition only happens when the logger level admits the record.
         """
-        level = f"{level}: " if level else ""
+        level_num = _LOG_LEVELS.get(level.lower(), _logging.INFO) if level else _logging.INFO
+        if not _logger.isEnabledFor(level_num):
+            return
         cls_name = self.__class__.__name__
         config_name = f" '{self.name}'" if name else ""
         func_name = f", {func.__name__}()" if func else ""
-        print(f"{level}{cls_name}{config_name}{func_name}: {msg}")
+        _logger.log(level_num, "%s%s%s: %s", cls_name, config_name, func_name, msg)
+
+    def _refresh_creation_defaults(self):
+        """Precompute filtered views of the creation default values.
+
+        Strips the ignored ('_'-prefixed) keys of :py:attr:`~._OptionsConfig._default_option_creation_values`
+        once, so :py:meth:`~._OptionsConfig.get_options` does not repeat the same string checks on the same
+        keys on every call. Re-call this after adding default creation values at runtime.
+        """
+        defaults = self._default_option_creation_values
+        self._defaults_uncond = {attr: value
+                                 for attr, value in defaults.unconditional.items()
+                                 if not attr.startswith("_")}
+        self._defaults_cond = {
+            attr: {case_key: {cond_attr: value
+                              for cond_attr, value in case.items()
+                              if not cond_attr.startswith("_")}
+                   for case_key, case in cases.items()}
+            for attr, cases in defaults.conditional.items()
+            if not attr.startswith("_")}
 
     def _check_if_initalized(self) -> bool:
         """Checks if :py:meth:`~._OptionsConfig.initialize` has been called.
@@ -167,10 +320,11 @@ class _OptionsConfig:
 
         To set manually, set underlying list :py:attr:`~._OptionsConfig._computers`.
         """
-        if self._computers:
-            return self._computers
-        else:
-            return _jutools.computer.get_computers(computer_name_pattern=self.name)
+        if not self._computers:
+            # memoize the guess: repeated property accesses within one get_options call
+            # would otherwise re-run the computer query each time
+            self._computers = _jutools.computer.get_computers(computer_name_pattern=self.name)
+        return self._computers
 
     @property
     def groups(self) -> _typing.List[_orm.Group]:
@@ -192,11 +346,41 @@ class _OptionsConfig:
         """Synchronize the config's groups' option nodes with the instances options property.
         """
         # refresh options attribute as collection of all distinct Dicts from all groups
-        if self._is_initialized:
+        if self._is_initialized and self._options_dirty:
             qb = _orm.QueryBuilder()
-            group_names = [group.label for group in self._groups]
+            group_names = list(self._group_labels)
             qb.append(_orm.Group, filters={"label": {"in": group_names}}, tag="group")
-            self._options = qb.append(_orm.Dict, with_group="group").distinct().all(flat=True)
+            qb.append(_orm.Dict, with_group="group", project=["*"]).distinct()
+            # stream results in batches instead of materializing the full result set at once
+            self._options = [option for (option,) in qb.iterall(batch_size=100)]
+            self._options_dirty = False
+            self._queue_index = None
+
+    def _get_queue_index(self) -> _typing.Dict[_typing.Optional[str], _typing.List[tuple]]:
+        """Index of the config's mpi-relevant option node attributes, keyed by queue name.
+
+        A single projection query fetches only the needed attribute paths, instead of decoding every
+        option node's full attributes dict in Python one ORM access at a time. Repeated queue lookups in
+        :py:meth:`~._OptionsConfig.get_options` are then plain dict accesses. Rebuilt whenever the options
+        cache is refreshed.
+
+        :return: dict queue name (possibly None) -> list of
+                 (withmpi, tot_num_mpiprocs, num_mpiprocs_per_machine) tuples, entries None if unset.
+        """
+        self._update_options()
+        if self._queue_index is None:
+            index = _collections.defaultdict(list)
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={"label": {"in": list(self._group_labels)}}, tag="group")
+            qb.append(_orm.Dict, with_group="group",
+                      project=["attributes.queue_name",
+                               "attributes.withmpi",
+                               "attributes.resources.tot_num_mpiprocs",
+                               "attributes.resources.num_mpiprocs_per_machine"]).distinct()
+            for queue_name, withmpi, totmpi, mpiper in qb.iterall(batch_size=100):
+                index[queue_name].append((withmpi, totmpi, mpiper))
+            self._queue_index = dict(index)
+        return self._queue_index
 
     @property
     def options(self) -> _typing.List[_orm.Dict]:
@@ -254,36 +438,41 @@ class _OptionsConfig:
             self._groups.append(group)
         group_names = [group.label for group in self._groups]
 
-        # load already stored groups
+        # load already stored groups, all with a single IN-filter query instead of
+        # one Group.get + NotExistent try/except per group
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.Group, filters={"label": {"in": group_names}}, project=["*"])
+        stored_groups = {group.label: group for group in qb.all(flat=True)}
         for i, group_name in enumerate(group_names):
-            try:
-                stored_group = _orm.Group.get(label=group_name)
-                self._groups[i] = stored_group
-            except _aiida.common.exceptions.NotExistent as err:
-                pass
+            if group_name in stored_groups:
+                self._groups[i] = stored_groups[group_name]
+
+        # the label set returned by the single query above is the ground truth for which groups exist
+        # in the db; build the mask from it instead of touching each group's is_stored property (which
+        # may refresh from the backend), then operate on the mask for the group-list consolidation below
+        stored_mask = [group_name in stored_groups for group_name in group_names]
 
         # if no default groups loaded but alternative groups loaded, get rid of default groups
-        if not any(
-                group.is_stored for group in self._groups[:default_groups_count]
-        ) and any(
-            group.is_stored for group in self._groups[default_groups_count:]
-        ):
+        if not any(stored_mask[:default_groups_count]) and any(stored_mask[default_groups_count:]):
             self._groups[:] = self._groups[default_groups_count:]
+            stored_mask = stored_mask[default_groups_count:]
 
         # if now any groups loaded, skip creation and remove the unstored ones
-        if any(group.is_stored for group in self._groups):
-            self._groups[:] = [group for group in self._groups if group.is_stored]
+        if any(stored_mask):
+            self._groups[:] = [group for group, stored in zip(self._groups, stored_mask) if stored]
+            stored_mask = [True] * len(self._groups)
 
         # now we have our final group list.
-        loaded_or_created = (
-            "Loaded" if all(g.is_stored for g in self._groups) else "Created"
-        )
+        loaded_or_created = "Loaded" if all(stored_mask) else "Created"
 
         # if now no groups loaded, ditch all groups except the primary one, and 'create' (store)
-        if not any(group.is_stored for group in self._groups):
+        if not any(stored_mask):
             self._groups[:] = [self._groups[0]]
             self._groups[0].store()
 
+        # final group list reached: refresh the label cache used by all queries below and later on
+        self._group_labels = tuple(group.label for group in self._groups)
+
         # Step2): options nodes initialize:
         #
         # note that Dict instances in _options attribute after init are unstored options.
@@ -292,42 +481,269 @@ class _OptionsConfig:
         # look for default options in all groups.
         # if any option is missing, create it and add it to all groups.
 
-        # replace temporary options with loaded option where it exists
+        # replace temporary options with loaded option where it exists.
+        # fetch all stored options of all groups with a single JOIN query instead of iterating
+        # group.nodes per group (N+1 pattern); attribute comparison then runs on the fetched rows only.
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.Group, filters={"label": {"in": list(self._group_labels)}}, tag="group")
+        qb.append(_orm.Dict, with_group="group", project=["*"])
+        stored_group_options = qb.distinct().all(flat=True)
+
+        # index stored options by an attributes digest once, then match each temporary option with a
+        # single hash lookup: O(N+M) instead of O(N*M) deep dict comparisons
+        stored_by_hash = {}
+        for group_option in stored_group_options:
+            stored_by_hash.setdefault(_attributes_hash(group_option.attributes), group_option)
+
         for i in range(len(self._options)):
             option = self._options[i]
-            found = False
-            for group in self._groups:
-                if not found:
-                    group_options = [node for node in list(group.nodes) if
-                                     (isinstance(node, _orm.Dict) and node.is_stored)]
-                    for group_option in group_options:
-                        if option.attributes == group_option.attributes:
-                            # before overwrite, preserve labels if any
-                            if self._options[i] and not group_option.label:
-                                group_option.label = self._options[i].label
-                            self._options[i] = group_option
-                            found = True
-                            break
+            group_option = stored_by_hash.get(_attributes_hash(option.attributes))
+            if group_option is not None:
+                # before overwrite, preserve labels if any
+                if self._options[i] and not group_option.label:
+                    group_option.label = self._options[i].label
+                self._options[i] = group_option
 
         num_loaded = len([option for option in self._options if option.is_stored])
         num_created = len(self._options) - num_loaded
 
-        # 'create' (store) all remaining unstored options and add to all groups
-        for option in self._options:
-            if not option.is_stored:
-                option.store()
-                for group in self._groups:
-                    group.add_nodes([option])
+        # 'create' (store) all remaining unstored options and add them to all groups,
+        # with one add_nodes call per group instead of one per (option, group) pair
+        new_options = [option for option in self._options if not option.is_stored]
+        for option in new_options:
+            option.store()
+        if new_options:
+            for group in self._groups:
+                group.add_nodes(new_options)
 
         # initialize is done.
         self._is_initialized = True
 
+        # fill the keyword caches for get_options kwarg validation
+        help = self.get_help(mode=self._help_config.keys_mode)
+        self._cached_options_keys = frozenset(help[self._help_config.keys_mode_return_key_options])
+        self._cached_resources_keys = frozenset(help[self._help_config.keys_mode_return_key_rescources])
+
+        # precompile the 'resources' validator: a closure over the valid JobResource subkeys, so the
+        # per-call validation in get_options is plain set lookups instead of re-derived schema checks
+        resources_keys = self._cached_resources_keys
+
+        def _validate_resources(resources: _typing.Any) -> _typing.Optional[dict]:
+            """Validate a user-supplied 'resources' value. Returns the (possibly filtered) dict, or None."""
+            if not isinstance(resources, dict):
+                self._log('Warning', self.get_options,
+                          f"Supplied keyword 'resources' with non-dict value {resources}. "
+                          f"But value must be a dict. I will ignore this keyword.")
+                return None
+            unknown = [key for key in resources if key not in resources_keys]
+            if unknown:
+                self._log('Warning', self.get_options,
+                          f"Supplied keyword 'resources' with subkeys {unknown} not valid for this config's "
+                          f"scheduler job resources. I will ignore these subkeys.")
+                return {key: value for key, value in resources.items() if key in resources_keys}
+            return resources
+
+        self._validate_resources = _validate_resources
+
         if not silent:
             print(f"OptionsConfig '{self.name}':\n"
                   f"{loaded_or_created} computer options groups: {[group.label for group in self._groups]}.\n"
                   f"Loaded {num_loaded}, created {num_created} default computer options nodes. "
                   f"Use {self.get_options.__name__}() to load or create options nodes.")
 
+    def _missing_mandatory_arg_err_msg(self, argname: str, msg_suffix: str) -> str:
+        """Compose the error message for a missing mandatory options field."""
+        return f"Argument '{argname}' mandatory for config '{self.name}' but not supplied. {msg_suffix}."
+
+    def _resolve_queue_name(self,
+                            queue_name: str = None,
+                            computer_name: str = None,
+                            gpu: bool = None,
+                            silent: bool = False,
+                            **_unused) -> str:
+        """Handler for the mandatory 'queue_name' options field of :py:meth:`~._OptionsConfig.get_options`.
+
+        Validates a supplied queue name against the config's computers, or determines the currently least
+        occupied queue if none was supplied.
+
+        :param queue_name: options field. Queue/partition name. If not given, I will guess it.
+        :param computer_name: Optional: name of associated computer.
+        :param gpu: False: exclude GPU queues. True: include. None: don't care.
+        :param silent: True: do not print out any info.
+        :return: validated or determined queue name.
+        """
+        if not silent:
+            print(f"Missing mandatory argument 'queue_name'. Try find matching computer and "
+                  f"call {_jutools.computer.get_queues.__name__}().")
+            # query the currently least occupied queue and return options for that.
+            # but for that, need the associated computer node
+        queue_names = None
+        computer = None
+
+        # first try to get computer from config associated computers, if any
+        if not silent:
+            print(f"Try to get computer from config's assigned computers.")
+        idx_computer = 0
+        idx_remove_computer = []
+        while (not queue_names) and (idx_computer < len(self._computers)):
+            computer = self._computers[idx_computer]
+            try:
+                queue_names = _get_queues_cached(computer=computer,
+                                                 gpu=gpu,
+                                                 silent=silent)
+            except NotImplementedError as err:
+                self._log('Warning', self.get_options,
+                          f"Config's computer {computer.label} is not compatible with this config. "
+                          f"Reason: {_jutools.computer.get_queues.__name__} not implemented for this type "
+                          f"of computer). I will remove it from the config.")
+                idx_remove_computer.append(idx_computer)
+            idx_computer += 1
+        self._computers[:] = [computer for idx, computer in enumerate(self._computers)
+                              if idx not in idx_remove_computer]
+        if not queue_names:
+            # next try to get computer by query
+            computer_name_pattern = computer_name if computer_name else self.name
+            if not silent:
+                print(f"Try to get computer from name pattern '{computer_name_pattern}'.")
+            computers = _jutools.computer.get_computers(computer_name_pattern=computer_name_pattern)
+            if not computers:
+                # next, try decomposing config name into words and get computer from words,
+                # matching all words with a single OR-query instead of probing word by word
+                confwords = _CONFNAME_TOKEN_RE.findall(self.name)
+                if confwords:
+                    computers = _jutools.computer.get_computers(computer_name_pattern=confwords)
+            if not computers:
+                raise _aiida.common.exceptions.NotExistent(
+                    self._missing_mandatory_arg_err_msg("queue_name",
+                                                        f"Found no matching computer with name pattern "
+                                                        f"'{computer_name_pattern}'."))
+            else:
+                idx_computer = 0
+                while (not queue_names) and (idx_computer < len(computers)):
+                    computer = computers[idx_computer]
+                    queue_names = _get_queues_cached(computer=computer,
+                                                     gpu=gpu,
+                                                     silent=silent)
+                    if queue_names:
+                        self._computers.append(computer)
+                    idx_computer += 1
+        if queue_names and not silent:
+            print(f"Found queue_names '{queue_names}'.")
+        if not queue_names:
+            raise ValueError(
+                self._missing_mandatory_arg_err_msg("queue_name",
+                                                    f"Could not determine queue_name from computer."))
+
+        if queue_name:
+            # make sure that the supplied queue name actually exists on that computer.
+            if queue_name not in queue_names:
+                raise ValueError(f"Supplied queue_name {queue_name} does not exist / not available for "
+                                 f"associated computer {computer} of options config {self.name}.")
+        else:
+            if not silent:
+                print("Choosing least occupied queue.")
+            queue_name = queue_names[0]
+        return queue_name
+
+    def _resolve_account(self,
+                         account: str = None,
+                         **_unused) -> str:
+        """Handler for the mandatory 'account' options field of :py:meth:`~._OptionsConfig.get_options`.
+
+        :param account: options field. For configs (computers) with account-based queue assignment.
+        :return: the supplied account.
+        """
+        if not account:
+            raise NotImplementedError(
+                self._missing_mandatory_arg_err_msg("account",
+                                                    f"I have no implementation to determine it automatically."))
+        return account
+
+    def _handle_withmpi(self,
+                        case: dict,
+                        opt_dict: dict,
+                        withmpi: bool,
+                        queue_name: str = None,
+                        user_resources: dict = None):
+        """Handler for the conditional 'withmpi' creation defaults of :py:meth:`~._OptionsConfig.get_options`.
+
+        Fills ``opt_dict`` with the default values of the matching withmpi case. If neither the 'resources'
+        default nor the user-supplied 'resources' specify mpi process counts, determines them from existing
+        options or the config's computers.
+
+        :param case: the creation default argument:value pairs for the given withmpi value, with ignored
+               ('_'-prefixed) keys already filtered out (see :py:meth:`~._OptionsConfig._refresh_creation_defaults`).
+        :param opt_dict: the options dict under construction. Modified in place.
+        :param withmpi: options field.
+        :param queue_name: options field. Queue/partition name.
+        :param user_resources: the user-supplied 'resources' options field, if any. If it already carries
+               mpi process counts, the determination fallbacks are skipped entirely.
+        """
+        user_resources = user_resources or {}
+        for cond_attr, value in case.items():
+            resources_mpi_keys = ["tot_num_mpiprocs", "num_mpiprocs_per_machine"]
+            if (cond_attr == "resources") and (withmpi) \
+                    and not any(value.get(rkey, None) for rkey in resources_mpi_keys) \
+                    and not any(user_resources.get(rkey, None) for rkey in resources_mpi_keys):
+                # in this case tot_num_mpi_procs is neither default nor user-specified
+                # (through kwargs), so must determine.
+                # copy-on-write: 'value' is the shared default dict; writing the determined
+                # counts into it directly would leak them into all subsequent calls.
+                value = dict(value)
+                tot_num_mpiprocs = None
+                mpiprocs_per_mac = None
+                resources_value = None
+
+                # mpi-relevant attributes of the config's option nodes, projected in one
+                # query and indexed by queue name, cached across get_options calls
+                queue_index = self._get_queue_index()
+
+                # first try: if queue_name is given, existing options with that queue name.
+                # assumption here: the max of mpi_procs of all options of that queue is still
+                # valid and a good guess.
+
+                if queue_name:
+                    # single pass with running maxima: no intermediate lists,
+                    # no second max() scan
+                    for opt_withmpi, totmpi, mpiper in queue_index.get(queue_name, ()):
+                        if opt_withmpi:
+                            if totmpi and (tot_num_mpiprocs is None or totmpi > tot_num_mpiprocs):
+                                tot_num_mpiprocs = totmpi
+                            if mpiper and (mpiprocs_per_mac is None or mpiper > mpiprocs_per_mac):
+                                mpiprocs_per_mac = mpiper
+
+                # if that failed (ie if no computers): go through existing option nodes and
+                # take the minimum. if none exist, choose value 1.
+                if not tot_num_mpiprocs and not mpiprocs_per_mac:
+                    # same single-pass scheme, this time with running minima
+                    for opt_withmpi, totmpi, mpiper in _itertools.chain.from_iterable(queue_index.values()):
+                        if opt_withmpi and totmpi is not None and mpiper is not None:
+                            if tot_num_mpiprocs is None or totmpi < tot_num_mpiprocs:
+                                tot_num_mpiprocs = totmpi
+                            if mpiprocs_per_mac is None or mpiper < mpiprocs_per_mac:
+                                mpiprocs_per_mac = mpiper
+                    if tot_num_mpiprocs is None:
+                        tot_num_mpiprocs = 1
+                    if mpiprocs_per_mac is None:
+                        mpiprocs_per_mac = 1
+
+                # if that failed, try via computer. short-circuits at the first computer with
+                # a default (the old index-counter loop never advanced and could spin forever).
+                if not tot_num_mpiprocs and not mpiprocs_per_mac:
+                    mpiprocs_per_mac = next(
+                        (mpiprocs for mpiprocs in (computer.get_default_mpiprocs_per_machine()
+                                                   for computer in self.computers)
+                         if mpiprocs), None)
+
+                if tot_num_mpiprocs and tot_num_mpiprocs > 1:
+                    value["tot_num_mpiprocs"] = tot_num_mpiprocs
+                elif mpiprocs_per_mac and mpiprocs_per_mac > 1:
+                    value["num_mpiprocs_per_machine"] = mpiprocs_per_mac
+                else:
+                    value["tot_num_mpiprocs"] = tot_num_mpiprocs
+
+            opt_dict[cond_attr] = value
+
     def get_options(self,
                     store_if_not_exist: bool = True,
                     as_Dict: bool = True,
@@ -369,22 +785,16 @@ class _OptionsConfig:
                See :py:meth:`~._OptionsConfig.get_help`.
         :return: list of options.
         """
-        # DEVNOTE: adjust this if signature changes! (ie if other options keywords are moved from kwargs to named
-        #          method arguments). This affects also option query and creation sections below.
-        explicit_argument_keywords = ['withmpi', 'queue_name', 'account']
-
         if not self._check_if_initalized():
             return []
 
         if not silent:
             self._log('Info', self.get_options)
 
-        # first, validate the remaining options keywords (kwargs) before starting the query
-        help = self.get_help(mode='keywords')
-        all_options_keys = help.pop(self._help_config.keys_mode_return_key_options)
-        resources_keys = help.pop(self._help_config.keys_mode_return_key_rescources)
-        # need to pop explicit argument keywords to avoid double occurrence
-        all_options_keys[:] = [k for k in all_options_keys if k not in explicit_argument_keywords]
+        # first, validate the remaining options keywords (kwargs) before starting the query.
+        # uses the keyword sets cached by initialize() instead of re-running get_help() per call.
+        # need to remove explicit argument keywords to avoid double occurrence
+        all_options_keys = self._cached_options_keys - _EXPLICIT_ARG_KEYWORDS
         invalid_kwargs = {k: v for k, v in kwargs.items() if k not in all_options_keys}
         valid_kwargs = kwargs if not invalid_kwargs else {k: v for k, v in kwargs.items() if k in all_options_keys}
         if invalid_kwargs:
@@ -392,129 +802,45 @@ class _OptionsConfig:
                       f"Supplied some invalid options keywords: {list(invalid_kwargs.keys())}. "
                       f"I will ignore these. Call {self.get_help.__name__} to list allowed keywords.")
         # special treatment for keyword 'resources': value must be a dict and its allowed keywords are defined
-        # by the computer's scheduler's JobResource.
+        # by the computer's scheduler's JobResource. validated via the closure precompiled in initialize().
         if 'resources' in valid_kwargs:
-            if not isinstance(valid_kwargs['resources'], dict):
-                self._log('Warning', self.get_options,
-                          f"Supplied keyword 'resources' with non-dict value {valid_kwargs['resources']}. "
-                          f"But value must be a dict. I will ignore this keyword.")
+            resources = self._validate_resources(valid_kwargs['resources'])
+            if resources is None:
                 valid_kwargs.pop('resources')
-
-        def missing_mandatory_arg_err_msg(argname, msg_suffix):
-            return f"Argument '{argname}' mandatory for config '{self.name}' but not supplied. {msg_suffix}."
-
-        # if some mandatory arguments need validation or are missing,
-        # try getting them from the computer config it it allows it
-        idx_mandatory_key = 0
-        for idx_mandatory_key, mandatory_key in enumerate(self._query_config.mandatory):
-            if mandatory_key == "queue_name":
-                if not silent:
-                    print(f"Missing mandatory argument 'queue_name'. Try find matching computer and "
-                          f"call {_jutools.computer.get_queues.__name__}().")
-                    # query the currently least occupied queue and return options for that.
-                    # but for that, need the associated computer node
-                queue_names = None
-
-                # first try to get computer from config associated computers, if any
-                if not silent:
-                    print(f"Try to get computer from config's assigned computers.")
-                idx_computer = 0
-                idx_remove_computer = []
-                while (not queue_names) and (idx_computer < len(self._computers)):
-                    computer = self._computers[idx_computer]
-                    try:
-                        queue_names = _jutools.computer.get_queues(computer=computer,
-                                                                   gpu=gpu,
-                                                                   with_node_count=False,
-                                                                   silent=silent)
-                    except NotImplementedError as err:
-                        self._log('Warning', self.get_options,
-                                  f"Config's computer {computer.label} is not compatible with this config. "
-                                  f"Reason: {_jutools.computer.get_queues.__name__} not implemented for this type "
-                                  f"of computer). I will remove it from the config.")
-                        idx_remove_computer.append(idx_computer)
-                    idx_computer += 1
-                self._computers[:] = [computer for idx, computer in enumerate(self._computers)
-                                      if idx not in idx_remove_computer]
-                if not queue_names:
-                    # next try to get computer by query
-                    computer_name_pattern = computer_name if computer_name else self.name
-                    if not silent:
-                        print(f"Try to get computer from name pattern '{computer_name_pattern}'.")
-                    computers = _jutools.computer.get_computers(computer_name_pattern=computer_name_pattern)
-                    if not computers:
-                        # next, try decomposing config name into words and get computer from words
-                        confwords = (" ".join(_re.findall("[a-zA-Z]+", self.name))).split(" ")
-                        idx_words = 0
-                        while (not computers) and (idx_words < len(confwords)):
-                            computers = _jutools.computer.get_computers(computer_name_pattern=confwords[idx_words])
-                            idx_words += 1
-                    if not computers:
-                        raise _aiida.common.exceptions.NotExistent(
-                            missing_mandatory_arg_err_msg("queue_name",
-                                                          f"Found no matching computer with name pattern "
-                                                          f"'{computer_name_pattern}'."))
-                    else:
-                        idx_computer = 0
-                        while (not queue_names) and (idx_computer < len(computers)):
-                            computer = computers[idx_computer]
-                            queue_names = _jutools.computer.get_queues(computer=computer,
-                                                                       gpu=gpu,
-                                                                       with_node_count=False,
-                                                                       silent=silent)
-                            if queue_names:
-                                self._computers.append(computer)
-                            idx_computer += 1
-                if queue_names and not silent:
-                    print(f"Found queue_names '{queue_names}'.")
-                if not queue_names:
-                    raise ValueError(
-                        missing_mandatory_arg_err_msg("queue_name",
-                                                      f"Could not determine queue_name from computer."))
-
-                if queue_name:
-                    # make sure that the supplied queue name actually exists on that computer.
-                    if queue_name not in queue_names:
-                        raise ValueError(f"Supplied queue_name {queue_name} does not exist / not available for "
-                                         f"associated computer {computer} of options config {self.name}.")
-                else:
-                    if not silent:
-                        print("Choosing least occupied queue.")
-                    queue_name = queue_names[0]
-
-            if mandatory_key == "account":
-                if not account:
-                    raise NotImplementedError(
-                        missing_mandatory_arg_err_msg("account",
-                                                      f"I have no implementation to determine it automatically."))
-        if self._query_config.mandatory and (idx_mandatory_key != (len(self._query_config.mandatory) - 1)):
-            self._log('Warning', self.get_options, "Did not handle all mandatory options keywords for this config. "
-                                                   "If it works regardless, adjust query config. Else, contact "
-                                                   "developer.")
+            else:
+                valid_kwargs['resources'] = resources
+
+        # if some mandatory arguments need validation or are missing, try getting them from the
+        # computer config if it allows it. each mandatory keyword dispatches to its handler in O(1).
+        params = {"queue_name": queue_name,
+                  "account": account,
+                  "computer_name": computer_name,
+                  "gpu": gpu,
+                  "silent": silent}
+        for mandatory_key in self._query_config.mandatory:
+            handler = self._mandatory_handlers.get(mandatory_key)
+            if handler is None:
+                self._log('Warning', self.get_options,
+                          f"No handler for mandatory options keyword '{mandatory_key}' of this config. "
+                          f"If it works regardless, adjust query config. Else, contact developer.")
+                continue
+            params[mandatory_key] = handler(**params)
+        queue_name = params["queue_name"]
+        account = params["account"]
 
         # now either load or create options
         loaded, stored = True, True
 
         # now try to load (query) the desired options node first
-        qb = _orm.QueryBuilder()
         tag_group = "group"
-        group_names = [group.label for group in self._groups]
-        qb.append(_orm.Group, filters={"label": {"in": group_names}}, tag=tag_group)
-        filters = {"and": []}
+        group_names = list(self._group_labels)
+        # collect (attribute path, value) pairs first and build the filter dicts in one pass at the end,
+        # instead of allocating a one-key dict per append
+        filter_pairs = []
         if queue_name:
-            filters["and"].append({"attributes.queue_name": queue_name})
-        if account:
-            filters["and"].append({"attributes.custom_scheduler_commands": {"ilike": f"%--account={account}%"}})
-            # DEVNOTE: in theory, we should instead require ...
-            # filters["and"].append({"attributes.account": account})
-            # ... but the latter does not work on all systems (case in point: claix18, slurm scheduler),
-            # whereas the former works on at least one system (case in point: claix18, slurm scheduler).
-            # With 'does not work' meaning, that the generated _aiidasubmit.sh slurm batch job script
-            # does not contain the account when the latter is used.
-            # Based on this, we adopt the former (custom_scheduler_commands) approach for ALL systems,
-            # at least for now.
+            filter_pairs.append(("attributes.queue_name", queue_name))
         if withmpi:
-            filters["and"].append({"attributes.withmpi": withmpi})
+            filter_pairs.append(("attributes.withmpi", withmpi))
         # now add user-specified other option attributes to query
         for attr, value in valid_kwargs.items():
             if isinstance(value, list):
@@ -530,14 +856,49 @@ class _OptionsConfig:
                                   f"No support for lists or nested attributes above level 2. "
                                   f"I will ignore this subattribute.")
                         continue
-                    attr_string = f"attributes.{attr}.{subattr}"
-                    filters["and"].append({attr_string: subvalue})
+                    filter_pairs.append((f"attributes.{attr}.{subattr}", subvalue))
             else:
-                attr_string = f"attributes.{attr}"
-                filters["and"].append({attr_string: value})
+                filter_pairs.append((f"attributes.{attr}", value))
+
+        filters = {"and": [{key: value} for key, value in filter_pairs]}
+
+        # batch the IN-filter over group labels to respect the query parameter limit; list-valued
+        # kwargs are rejected above, so the group labels are the only unbounded IN-filter here.
+        # project only the pk per batch (attribute-heavy Dict rows are 10-100x larger), union the
+        # batches deduplicated by pk, then materialize the matched Dicts with one final query.
+        def _query_pks(filters: dict) -> _typing.List[int]:
+            res_pks = []
+            seen_pks = set()
+            for label_batch in _batch_iter(group_names):
+                qb = _orm.QueryBuilder()
+                qb.append(_orm.Group, filters={"label": {"in": label_batch}}, tag=tag_group)
+                qb.append(_orm.Dict, with_group=tag_group, filters=filters, project=["id"])
+                for pk in qb.all(flat=True):
+                    if pk not in seen_pks:
+                        seen_pks.add(pk)
+                        res_pks.append(pk)
+            return res_pks
+
+        if account:
+            # Query the exact match on 'account' on its own first: OR-ing it with the
+            # leading-wildcard ILIKE would impose the ILIKE's sequential scan over all Dicts in
+            # the groups on every call. The ILIKE runs only as a separate fallback, and only when
+            # the exact match comes up empty, to still find legacy nodes created before the
+            # 'account' attribute was stored alongside custom_scheduler_commands (see creation
+            # section below).
+            res_pks = _query_pks({"and": filters["and"] + [{"attributes.account": account}]})
+            if not res_pks:
+                res_pks = _query_pks(
+                    {"and": filters["and"]
+                     + [{"attributes.custom_scheduler_commands": {"ilike": f"%--account={account}%"}}]})
+        else:
+            res_pks = _query_pks(filters)
 
-        qb.append(_orm.Dict, with_group=tag_group, filters=filters)
-        res = qb.all(flat=True)
+        res = []
+        for pk_batch in _batch_iter(res_pks):
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Dict, filters={"id": {"in": pk_batch}}, project=["*"])
+            res.extend(qb.all(flat=True))
 
         # if no results, create a temporary options node (ie without storing).
         # storing only if store_if_not_exist True.
@@ -556,17 +917,14 @@ class _OptionsConfig:
                 opt_dict["queue_name"] = queue_name
                 opt_label += f"_{queue_name}"
             if account:
+                # store 'account' itself so queries can use an indexed exact match on it, ...
+                opt_dict["account"] = account
+                # ... but ALSO keep the custom_scheduler_commands approach: the plain 'account' field
+                # does not make it into the generated _aiidasubmit.sh batch script on all systems
+                # (case in point: claix18, slurm scheduler), whereas the custom command does.
                 if not opt_dict.get("custom_scheduler_commands", None):
                     opt_dict["custom_scheduler_commands"] = "#SBATCH"
                 opt_dict["custom_scheduler_commands"] += f" --account={account}"
-                # DEVNOTE: in theory, we should instead require ...
-                # opt_dict["account"] = account
-                # ... but the latter does not work on all systems (case in point: claix18, slurm scheduler),
-                # whereas the former works on at least one system (case in point: claix18, slurm scheduler).
-                # With 'does not work' meaning, that the generated _aiidasubmit.sh slurm batch job script
-                # does not contain the account when the latter is used.
-                # Based on this, we adopt the former (custom_scheduler_commands) approach for ALL systems,
-                # at least for now.
                 opt_label += f"_{account}"
             if not withmpi:
                 opt_label += f"_serial"
@@ -588,86 +946,16 @@ class _OptionsConfig:
             # So always prefer options keywords over custom commands where available.
             # # # # #
 
-            # now add default argument:values
-            # # unconditional arguments
-            for attr, value in self._default_option_creation_values.unconditional.items():
-                if not attr.startswith("_"):
-                    opt_dict[attr] = value
-            # # conditional arguments
-            for attr, cases in self._default_option_creation_values.conditional.items():
-                if not attr.startswith("_"):
-                    # # # conditional: withmpi:
-                    if attr == "withmpi":
-                        # # # # get the matching case argument:value pairs
-                        for cond_attr, value in cases[withmpi].items():
-                            if not cond_attr.startswith("_"):
-                                resources_mpi_keys = ["tot_num_mpiprocs", "num_mpiprocs_per_machine"]
-                                if (cond_attr == "resources") and (withmpi) \
-                                        and not any(value.get(rkey, None) for rkey in resources_mpi_keys):
-                                    # in this case tot_num_mpi_procs is neither default nor user-specified
-                                    # (through kwargs), so must determine.
-                                    tot_num_mpiprocs = None
-                                    mpiprocs_per_mac = None
-                                    resources_value = None
-
-                                    # first try: if queue_name is given, existing options with that queue name.
-                                    # assumption here: the max of mpi_procs of all options of that queue is still
-                                    # valid and a good guess.
-
-                                    if queue_name:
-                                        queue_opts = [opt for opt in self.options if
-                                                      opt.attributes.get("queue_name", None) == queue_name]
-                                        if queue_opts:
-                                            node_totmpi = []
-                                            node_mpiper = []
-                                            for opt_node in queue_opts:
-                                                if opt_node.attributes.get("withmpi", None) and \
-                                                        opt_node.attributes.get("resources", None):
-                                                    totmpi = opt_node.attributes["resources"].get("tot_num_mpiprocs",
-                                                                                                  None)
-                                                    mpiper = opt_node.attributes["resources"].get(
-                                                        "num_mpiprocs_per_machine",
-                                                        None)
-                                                    if totmpi:
-                                                        node_totmpi.append(totmpi)
-                                                    if mpiper:
-                                                        node_mpiper.append(mpiper)
-                                            tot_num_mpiprocs = max(node_totmpi) if node_totmpi else None
-                                            mpiprocs_per_mac = max(node_mpiper) if node_mpiper else None
-
-                                    # if that failed (ie if no computers): go through existing option nodes and
-                                    # take the minimum. if none exist, choose value 1.
-                                    if not tot_num_mpiprocs and not mpiprocs_per_mac:
-                                        node_totmpi = []
-                                        node_mpiper = []
-                                        for opt_node in self.options:
-                                            try:
-                                                if opt_node.attributes["withmpi"]:
-                                                    node_totmpi.append(
-                                                        opt_node.attributes["resources"]["tot_num_mpiprocs"])
-                                                    node_mpiper.append(
-                                                        opt_node.attributes["resources"]["num_mpiprocs_per_machine"])
-                                            except KeyError as err:
-                                                pass
-                                        tot_num_mpiprocs = min(node_totmpi) if node_totmpi else 1
-                                        mpiprocs_per_mac = min(node_mpiper) if node_mpiper else 1
-
-                                    # if that failed, try via computer
-                                    if not tot_num_mpiprocs and not mpiprocs_per_mac:
-                                        computers = self.computers
-                                        idx_computer = 0
-                                        while (not mpiprocs_per_mac) and (idx_computer < len(computers)):
-                                            mpiprocs_per_mac = computers[
-                                                idx_computer].get_default_mpiprocs_per_machine()
-
-                                    if tot_num_mpiprocs and tot_num_mpiprocs > 1:
-                                        value["tot_num_mpiprocs"] = tot_num_mpiprocs
-                                    elif mpiprocs_per_mac and mpiprocs_per_mac > 1:
-                                        value["num_mpiprocs_per_machine"] = mpiprocs_per_mac
-                                    else:
-                                        value["tot_num_mpiprocs"] = tot_num_mpiprocs
-
-                                opt_dict[cond_attr] = value
+            # now add default argument:values (ignored keys already filtered out at init)
+            # # unconditional arguments: single C-level dict merge
+            opt_dict.update(self._defaults_uncond)
+            # # conditional arguments: dispatch each attribute to its registered handler in O(1)
+            # instead of comparing attribute names inside a nested loop
+            for attr, cases in self._defaults_cond.items():
+                handler = self._conditional_handlers.get(attr)
+                if handler:
+                    handler(cases[withmpi], opt_dict, withmpi, queue_name,
+                            valid_kwargs.get("resources", None))
 
             # now add user-specified other option attributes.
             # these my overwrite default values.
@@ -675,50 +963,59 @@ class _OptionsConfig:
                 if (not isinstance(value, dict)) or (not opt_dict.get(attr, None)):
                     opt_dict[attr] = value
                 else:
-                    # guard against dict values override, nesting level0
-                    for subattr, subvalue in value.items():
-                        opt_dict[attr][subattr] = subvalue
+                    # guard against dict values override, nesting level0. the merged copy also keeps
+                    # the shared default sub-dicts free of user values.
+                    opt_dict[attr] = {**opt_dict[attr], **value}
 
             # now turn opt_dict into a option node and store in group, if so specified.
-            opt_Dict = _orm.Dict(label="", dict=opt_dict)
-            opt_Dict.label = opt_label
+            # pass the label to the constructor directly: reassigning .label afterwards goes
+            # through a second attribute-write path in aiida
+            opt_Dict = _orm.Dict(label=opt_label, dict=opt_dict)
             if store_if_not_exist:
                 stored = True
                 opt_Dict.store()
                 for group in self.groups:
                     group.add_nodes([opt_Dict])
+                self._options_dirty = True
 
             # and turn into return value
             res = [opt_Dict]
 
         # resources is mandatory and (if created), if not user-supplied, should be set via creation defaults.
+        # partition res into valid / invalid in a single pass; the valid list replaces res afterwards,
+        # so no second scan with attribute re-decoding is needed.
+        valid_opts = []
         invalid_stored_opt_nodes = []
         invalid_unstored_opt_Dicts = []
         for opt in res:
-            idx_to_pop = []
-            if not opt.attributes.get("resources", None):
+            # decode the node's attributes once per option instead of once per access
+            attrs = opt.attributes
+            resources = attrs.get("resources", None)
+            if not resources:
                 if opt.is_stored:
                     invalid_stored_opt_nodes.append(opt)
                 else:
                     invalid_unstored_opt_Dicts.append(opt)
             else:
+                valid_opts.append(opt)
                 # even if resources is there, subfields might clash (e.g. user args and default creation values clash).
-                resources = opt.attributes["resources"]
-                clashable_subkeys = ['num_machines', 'num_mpiprocs_per_machine', 'tot_num_mpiprocs']
-                if all(subkey in resources for subkey in clashable_subkeys):
+                if _CLASHABLE_SUBKEYS.issubset(resources):
                     self._log("Warning", self.get_options, f"One or more determined options' 'resources' have all "
-                                                           f"three subfields {clashable_subkeys} defined. Check "
-                                                           f"that these don't clash.")
-        res[:] = [opt for opt in res if opt.attributes.get("resources", None)]
+                                                           f"three subfields {sorted(_CLASHABLE_SUBKEYS)} defined. "
+                                                           f"Check that these don't clash.")
+        res = valid_opts
         if invalid_stored_opt_nodes or invalid_unstored_opt_Dicts:
-            msg = f"The determined options are missing the mandatory field 'resources'. Either because configs group " \
-                  f"contains such invalid options nodes, or because during creation, 'resources' was not supplied or " \
-                  f"could not be determined. In case of stored invalid nodes, I strongly suggest, you delete them " \
-                  f"via {self.delete_options.__name__}(). I will exclude these options from the return value and " \
-                  f"instead list them here.\n" \
-                  f"Invalid created options:\n{[opt.attributes for opt in invalid_unstored_opt_Dicts]}.\n" \
-                  f"Invalid loaded options:\n{invalid_stored_opt_nodes}."
-            self._log("Warning", self.get_options, msg)
+            # the message decodes every invalid option's attributes, so only compose it if the
+            # logger will actually emit it
+            if _logger.isEnabledFor(_logging.WARNING):
+                msg = f"The determined options are missing the mandatory field 'resources'. Either because configs " \
+                      f"group contains such invalid options nodes, or because during creation, 'resources' was not " \
+                      f"supplied or could not be determined. In case of stored invalid nodes, I strongly suggest, " \
+                      f"you delete them via {self.delete_options.__name__}(). I will exclude these options from the " \
+                      f"return value and instead list them here.\n" \
+                      f"Invalid created options:\n{[opt.attributes for opt in invalid_unstored_opt_Dicts]}.\n" \
+                      f"Invalid loaded options:\n{invalid_stored_opt_nodes}."
+                self._log("Warning", self.get_options, msg)
             return []
 
         # return the load_or_create result
@@ -735,6 +1032,60 @@ class _OptionsConfig:
 
         return res if as_Dict else [node.attributes for node in res]
 
+    def get_options_bulk(self,
+                         list_of_kwargs: _typing.List[dict],
+                         store_if_not_exist: bool = True,
+                         as_Dict: bool = True,
+                         silent: bool = True) -> _typing.Union[_typing.List[_orm.Dict], _typing.List[_typing.Dict]]:
+        """Load or create many options in one go.
+
+        Calling :py:meth:`~._OptionsConfig.get_options` in a loop with storing enabled pays the full
+        per-node database write cost for every created option, plus one group membership insert per node
+        and group. This method defers all storing: it first builds / loads all options without storing,
+        deduplicating identical kwargs dicts within the batch, then stores the newly created ones and
+        adds them to each group with a single ``add_nodes`` call, all inside one database transaction,
+        so the whole batch commits at once.
+
+        :param list_of_kwargs: list of keyword argument dicts, one per desired options node, each as
+               accepted by :py:meth:`~._OptionsConfig.get_options` (minus the store/return arguments).
+        :param store_if_not_exist: True: store all newly created options Dicts after the batch.
+        :param as_Dict: True: return matching options as AiiDA Dicts. False: as dicts.
+        :param silent: True: do not print out any info. False: only print warnings.
+        :return: flat list of options, in the order of the supplied kwargs dicts.
+        """
+        if not self._check_if_initalized():
+            return []
+
+        res = []
+        to_store = []
+        # identical kwargs dicts within one batch would each create their own new node: the per-call
+        # creation path queries the database and cannot see an earlier, still-unstored sibling.
+        # dedupe on a canonical key and reuse the first result instead.
+        options_by_key = {}
+        for kwargs in list_of_kwargs:
+            key = _json.dumps(kwargs, sort_keys=True, default=str)
+            options = options_by_key.get(key)
+            if options is None:
+                options = self.get_options(store_if_not_exist=False,
+                                           as_Dict=True,
+                                           silent=silent,
+                                           **kwargs)
+                options_by_key[key] = options
+                to_store.extend(opt for opt in options if not opt.is_stored)
+            res.extend(options)
+
+        if store_if_not_exist and to_store:
+            # one transaction for the whole batch: the node stores and group inserts commit
+            # together instead of once per write.
+            with _get_manager().get_backend().transaction():
+                for opt_Dict in to_store:
+                    opt_Dict.store()
+                for group in self.groups:
+                    group.add_nodes(to_store)
+            self._options_dirty = True
+
+        return res if as_Dict else [node.attributes for node in res]
+
     def get_help(self,
                  mode: str,
                  *args) -> _typing.Dict[str, _typing.Any]:
@@ -763,7 +1114,7 @@ class _OptionsConfig:
         is_mode_keys = (mode == self._help_config.keys_mode)
         is_mode_desc = (mode == self._help_config.desc_mode)
 
-        all_options_keys = sorted(list(_aiida_engine.CalcJob.spec_options.keys()))
+        all_options_keys, all_descriptions = _get_spec_options_cached()
 
         if is_mode_desc:
             invalid_options_keys = [k for k in args if k not in all_options_keys]
@@ -771,15 +1122,26 @@ class _OptionsConfig:
             if invalid_options_keys:
                 self._log('Warning', self.get_help, f"Supplied some invalid options keywords: "
                                                     f"{list(invalid_options_keys)}.")
+            if args and not valid_options_keys:
+                # every supplied keyword was invalid: falling back to all descriptions would be
+                # misleading, and there is nothing valid to describe.
+                return {}
 
             selected_keys = valid_options_keys or all_options_keys
-            all_descriptions = _aiida_engine.CalcJob.spec_options.get_description()
-            descriptions = {k: v for k, v in all_descriptions.items() if k in selected_keys}
-            return {k: descriptions[k] for k in sorted(descriptions)}
+            if selected_keys is not all_options_keys:
+                # user-supplied keywords may come in any order; all_options_keys is sorted already
+                selected_keys = sorted(selected_keys)
+            # single pass instead of filter-then-sort with two dict constructions
+            return {k: all_descriptions[k] for k in selected_keys if k in all_descriptions}
 
         elif is_mode_keys:
             # special treatment for keyword 'resources': its value is a dict with sub-keywords. those allowed
-            # keywords are defined by the computer's scheduler's JobResource.
+            # keywords are defined by the computer's scheduler's JobResource. the determination below may hit
+            # the database (computers, schedulers), so reuse the first result for the instance's lifetime.
+            if self._help_resources_keys is not None:
+                return {self._help_config.keys_mode_return_key_options: all_options_keys,
+                        self._help_config.keys_mode_return_key_rescources: self._help_resources_keys}
+
             resources_keys = []
 
             # for need corresponding JobResource. First try to get from class attribute.
@@ -795,18 +1157,21 @@ class _OptionsConfig:
                 # this likely means that base JobResource class is used, which defines no valid keys.
                 # but this may not be the actual corresponding computer's JobResource class. So try
                 # getting it via the computer now.
-                i = 0
-                while (not resources_keys) and (i < len(self.computers)):
-                    resources_keys = self.computers[i].get_scheduler().job_resource_class.get_valid_keys()
-                    i += 1
+                # single property access, short-circuit at the first computer that yields keys
+                resources_keys = next(
+                    (keys for keys in (computer.get_scheduler().job_resource_class.get_valid_keys()
+                                       for computer in self.computers)
+                     if keys), [])
             if not resources_keys:
                 # since could not determine appropriate resources keys for this config, do sth else instead:
                 # gather all resources keys defined in all immediate JobResource subclasses and use that.
                 # note that this might be a bit unstable wrt aiida version changes.
+                from aiida.schedulers.plugins import lsf as _aiida_lsf_schedulers
                 resources_keys = sorted(list(set(_aiida_schedulers.NodeNumberJobResource.get_valid_keys()) +
                                              set(_aiida_schedulers.ParEnvJobResource.get_valid_keys()) +
                                              set(_aiida_lsf_schedulers.LsfJobResource.get_valid_keys())))
 
+            self._help_resources_keys = resources_keys
             return {self._help_config.keys_mode_return_key_options: all_options_keys,
                     self._help_config.keys_mode_return_key_rescources: resources_keys}
 
@@ -840,14 +1205,10 @@ class _OptionsConfig:
         if not all(node.is_stored for node in options_nodes):
             self._log("Warning", self.delete_options, f"Not all supplied nodes are stored. Aborting.")
             return
-        config_options = self.options
-        is_from_config = []
-        is_not_from_config_pks = []
-        for node in options_nodes:
-            found = any(node.pk == opt.pk for opt in self.options)
-            is_from_config.append(found)
-            if not found:
-                is_not_from_config_pks.append(node.pk)
+        # single options read + set membership instead of one full scan per supplied node
+        config_pks = {opt.pk for opt in self.options}
+        is_from_config = [node.pk in config_pks for node in options_nodes]
+        is_not_from_config_pks = [node.pk for node in options_nodes if node.pk not in config_pks]
         if not all(is_from_config):
             self._log("Warning", self.delete_options, f"Some supplied nodes ({is_not_from_config_pks}) are not nodes "
                                                       f"from this config.")
@@ -857,63 +1218,47 @@ class _OptionsConfig:
         if verbosity > 0:
             self._log("Info", self.delete_options, f"Deleting specified option nodes {pks} from config ...")
         _aiida_tools.delete_nodes(pks=pks, dry_run=dry_run, force=True, verbosity=verbosity)
-
-
-@_dc.dataclass(init=True, repr=True, eq=False, order=False, frozen=False)
-class ComputerOptionsManager:
-    """Manage computer options (builder.metdata.options) for AiiDA processes.
-
-    :param localhost: localhost config
-    :param iffslurm: iffslurm config
-    :param claix18: claix 2018 config
-    :param claix16: claix 2016 config
-
-    Call :py:meth:`~.ComputerOptionsManager.initialize` after creating instance.
-
-    - sets of sensible defaults options for common computers called 'configs'
-    - group-based options management which promotes load or create (reuse over redundancy)
-    - easily accessible help on options fields
-
-    Default configs available for these computers categories:
-
-    - 'iffslurm': FZJ PGI-1 iffslurm cluster.
-    - 'claix18': RWTH CLAIX 2018 cluster
-    - 'claix16': RWTH CLAIX 2016 cluster
-    - 'localhost': a generic localhost computer.
-
-    The configs become available as attributes, and expose their methods, like get options from them.
-    The manager provides most of the same methods with a list selection argument to include subsets
-    of configs. Depending on the method, using the configs' method directly (e.g. get options), or using
-    the manager's method (initialize all configs) is more useful.
-
-    The manager is basically a collection of named :py:class:`~._OptionsConfig` instances.
-
-    >>> import aiida
-    >>> import aiida_jutools as jutools
-    >>> aiida.load_profile()
-    >>> optman = jutools.computer.ComputerOptionsManager()
-    >>> optman.initialize()
-    >>> optman.iffslurm.get_options()
-    >>> optman.claix18.get_help()
-    """
-    localhost: _OptionsConfig = _masci_python_util.dataclass_default_field(_OptionsConfig(
+        if not dry_run:
+            self._options_dirty = True
+
+
+# Shared 'resources' default dicts for the default-config factories below: one allocation per
+# process instead of one per inline literal. orm.Dict copies its input on construction, and the
+# config code copies before mutating, so sharing these is safe. Treat them as read-only.
+_RES_SERIAL = {'num_machines': 1, 'tot_num_mpiprocs': 1}
+_RES_4 = {'num_machines': 1, 'tot_num_mpiprocs': 4}
+_RES_12 = {'num_machines': 1, 'tot_num_mpiprocs': 12}
+_RES_20 = {'num_machines': 1, 'tot_num_mpiprocs': 20}
+_RES_24 = {'num_machines': 1, 'tot_num_mpiprocs': 24}
+_RES_32 = {'num_machines': 1, 'tot_num_mpiprocs': 32}
+_RES_48 = {'num_machines': 1, 'tot_num_mpiprocs': 48}
+_RES_64 = {'num_machines': 1, 'tot_num_mpiprocs': 64}
+
+
+def _build_localhost_config() -> _OptionsConfig:
+    """Default config for a generic localhost computer. Built on demand, not at import time."""
+    return _OptionsConfig(
         name="localhost",
         _groups=[_orm.Group(label="computer_options/localhost",
                             description="Default computer options (Dict nodes) for a generic local computer.")],
         _options=[_orm.Dict(label="options_localhost_serial",
                             dict={'max_wallclock_seconds': (60 ** 2),
                                   'withmpi': False,
-                                  'resources': {'num_machines': 1, 'tot_num_mpiprocs': 1}}),
+                                  'resources': _RES_SERIAL}),
                   _orm.Dict(label="options_localhost",
                             dict={'max_wallclock_seconds': (60 ** 2),
                                   'withmpi': False,
-                                  'resources': {'num_machines': 1, 'tot_num_mpiprocs': 4}})],
+                                  'resources': _RES_4})],
         _query_config=_OptionsQueryConfig(ignored=["queue_name", "account", "gpu"],
                                           mandatory=[],
                                           optional=["withmpi"]),
         _silent=True
-    ), deepcopy=False)
-    iffslurm: _OptionsConfig = _masci_python_util.dataclass_default_field(_OptionsConfig(
+    )
+
+
+def _build_iffslurm_config() -> _OptionsConfig:
+    """Default config for the FZJ PGI-1 iffslurm cluster. Built on demand, not at import time."""
+    return _OptionsConfig(
         name="iffslurm",
         _groups=[_orm.Group(label="computer_options/iffslurm",
                             description="Default computer options (Dict nodes) for the FZJ PGI iffslurm computer."),
@@ -922,42 +1267,46 @@ class ComputerOptionsManager:
         _options=[_orm.Dict(label="options_iffslurm_oscar",
                             dict={"queue_name": "oscar", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": True,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 12}}),
+                                  "resources": _RES_12}),
                   _orm.Dict(label="options_iffslurm_oscar_serial",
                             dict={"queue_name": "oscar", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": False,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 1}}),
+                                  "resources": _RES_SERIAL}),
                   _orm.Dict(label="options_iffslurm_th1",
                             dict={"queue_name": "th1", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": True,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 12}}),
+                                  "resources": _RES_12}),
                   _orm.Dict(label="options_iffslurm_th1_serial",
                             dict={"queue_name": "th1", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": False,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 1}}),
+                                  "resources": _RES_SERIAL}),
                   _orm.Dict(label="options_iffslurm_th1-2020-32",
                             dict={"queue_name": "th1-2020-32", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": True,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 32}}),
+                                  "resources": _RES_32}),
                   _orm.Dict(label="options_iffslurm_th1-2020-32_serial",
                             dict={"queue_name": "th1-2020-32", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": False,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 1}}),
+                                  "resources": _RES_SERIAL}),
                   _orm.Dict(label="options_iffslurm_th1-2020-64",
                             dict={"queue_name": "th1-2020-64", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": True,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 64}}),
+                                  "resources": _RES_64}),
                   _orm.Dict(label="options_iffslurm_viti",
                             dict={"queue_name": "viti", "max_wallclock_seconds": (60 ** 2) * 24,
                                   "withmpi": True,
-                                  "resources": {"num_machines": 1, "tot_num_mpiprocs": 20}})],
+                                  "resources": _RES_20})],
         _query_config=_OptionsQueryConfig(ignored=["account"],
                                           mandatory=["queue_name"],
                                           optional=["gpu", "withmpi"]),
         _jobresource_cls=_aiida_slurm_schedulers.SlurmJobResource,
         _silent=True
-    ), deepcopy=False)
-    claix18: _OptionsConfig = _masci_python_util.dataclass_default_field(_OptionsConfig(
+    )
+
+
+def _build_claix18_config() -> _OptionsConfig:
+    """Default config for the RWTH CLAIX 2018 cluster. Built on demand, not at import time."""
+    return _OptionsConfig(
         name="claix18",
         _groups=[_orm.Group(label="computer_options/claix18",
                             description="Default computer options (Dict nodes) for the RWTH claix 2018 computer.")],
@@ -965,7 +1314,7 @@ class ComputerOptionsManager:
             _orm.Dict(label="options_claix18",
                       dict={'max_wallclock_seconds': (60 ** 2) * 24,
                             'withmpi': True,
-                            'resources': {'num_machines': 1, 'tot_num_mpiprocs': 48},
+                            'resources': _RES_48,
                             'custom_scheduler_commands': ""})
         ],
         _query_config=_OptionsQueryConfig(ignored=["queue_name", "gpu"],
@@ -973,8 +1322,12 @@ class ComputerOptionsManager:
                                           optional=["account", "withmpi"]),
         _jobresource_cls=_aiida_slurm_schedulers.SlurmJobResource,
         _silent=True
-    ), deepcopy=False)
-    claix16: _OptionsConfig = _masci_python_util.dataclass_default_field(_OptionsConfig(
+    )
+
+
+def _build_claix16_config() -> _OptionsConfig:
+    """Default config for the RWTH CLAIX 2016 cluster. Built on demand, not at import time."""
+    return _OptionsConfig(
         name="claix16",
         _groups=[_orm.Group(label="computer_options/claix16",
                             description="Default computer options (Dict nodes) for the RWTH claix 2016 computer.")],
@@ -982,7 +1335,7 @@ class ComputerOptionsManager:
             _orm.Dict(label="options_claix16",
                       dict={'max_wallclock_seconds': (60 ** 2) * 24,
                             'withmpi': True,
-                            'resources': {'num_machines': 1, 'tot_num_mpiprocs': 24},
+                            'resources': _RES_24,
                             'custom_scheduler_commands': ""})
         ],
         _query_config=_OptionsQueryConfig(ignored=["queue_name", "gpu"],
@@ -990,12 +1343,77 @@ class ComputerOptionsManager:
                                           optional=["account", "withmpi"]),
         _jobresource_cls=_aiida_slurm_schedulers.SlurmJobResource,
         _silent=True
-    ), deepcopy=False)
+    )
+
+
+# named default configs of ComputerOptionsManager: attribute name -> factory
+_DEFAULT_CONFIG_FACTORIES = {
+    "localhost": _build_localhost_config,
+    "iffslurm": _build_iffslurm_config,
+    "claix18": _build_claix18_config,
+    "claix16": _build_claix16_config,
+}
+
+
+@_dc.dataclass(init=True, repr=True, eq=False, order=False, frozen=False)
+class ComputerOptionsManager:
+    """Manage computer options (builder.metdata.options) for AiiDA processes.
+
+    :param localhost: localhost config
+    :param iffslurm: iffslurm config
+    :param claix18: claix 2018 config
+    :param claix16: claix 2016 config
+
+    Call :py:meth:`~.ComputerOptionsManager.initialize` after creating instance.
+
+    - sets of sensible defaults options for common computers called 'configs'
+    - group-based options management which promotes load or create (reuse over redundancy)
+    - easily accessible help on options fields
+
+    Default configs available for these computers categories:
+
+    - 'iffslurm': FZJ PGI-1 iffslurm cluster.
+    - 'claix18': RWTH CLAIX 2018 cluster
+    - 'claix16': RWTH CLAIX 2016 cluster
+    - 'localhost': a generic localhost computer.
+
+    The configs become available as attributes, and expose their methods, like get options from them.
+    The manager provides most of the same methods with a list selection argument to include subsets
+    of configs. Depending on the method, using the configs' method directly (e.g. get options), or using
+    the manager's method (initialize all configs) is more useful.
+
+    The manager is basically a collection of named :py:class:`~._OptionsConfig` instances.
+
+    >>> import aiida
+    >>> import aiida_jutools as jutools
+    >>> aiida.load_profile()
+    >>> optman = jutools.computer.ComputerOptionsManager()
+    >>> optman.initialize()
+    >>> optman.iffslurm.get_options()
+    >>> optman.claix18.get_help()
+    """
+    # Each default config embeds unstored ORM Group/Dict nodes, so construction is deferred to
+    # __post_init__ (via the module-level _build_* factories) instead of import-time class-body
+    # evaluation. Every manager instance gets its own config objects; the previous shared class-level
+    # defaults leaked state between instances.
+    localhost: _typing.Optional[_OptionsConfig] = None
+    iffslurm: _typing.Optional[_OptionsConfig] = None
+    claix18: _typing.Optional[_OptionsConfig] = None
+    claix16: _typing.Optional[_OptionsConfig] = None
 
     def __post_init__(self):
+        # build the default configs now (not at import time), unless the user supplied their own
+        for attr_name, factory in _DEFAULT_CONFIG_FACTORIES.items():
+            if getattr(self, attr_name) is None:
+                setattr(self, attr_name, factory())
+
         # note: we need this for the configs property. has to be updated when an option is added.
         # DEVNOTE: using getattr() / getmembers on self, with type checking, instead throws RecursionError.
         self._configs = [self.localhost, self.iffslurm, self.claix18, self.claix16]
+        # name -> config index for O(1) lookups; kept in sync with _configs
+        self._configs_by_name = {config.name: config for config in self._configs}
+        # memoized name validation results, keyed by the supplied names tuple; cleared on config changes
+        self._valid_names_cache = {}
         self._help_config = _OptionsConfig._HelpConfig()
 
         self._log("Info", None, f"Call {self.initialize.__name__}() before use.")
@@ -1005,14 +1423,16 @@ class ComputerOptionsManager:
              func=None,
              msg: str = "",
              name: bool = True):
-        """Basic logging.
+        """Basic logging, deferred to :py:mod:`logging`.
 
-        TODO replace with real logging / aiida logging.
+        Message composition only happens when the logger level admits the record.
         """
-        level = f"{level}: " if level else ""
+        level_num = _LOG_LEVELS.get(level.lower(), _logging.INFO) if level else _logging.INFO
+        if not _logger.isEnabledFor(level_num):
+            return
         cls_name = self.__class__.__name__
         func_name = f", {func.__name__}()" if func else ""
-        print(f"{level}{cls_name}{func_name}: {msg}")
+        _logger.log(level_num, "%s%s: %s", cls_name, func_name, msg)
 
     @property
     def configs(self) -> _typing.List[_OptionsConfig]:
@@ -1039,13 +1459,23 @@ class ComputerOptionsManager:
         :param config_names: selection of configs. If empty, select all configs.
         :return: groups of those configs.
         """
-        valid_config_names, _, _ = self._get_valid_config_names_from(config_names=config_names, silent=True)
+        valid_config_names = self._valid_names_only(config_names=config_names)
+        # valid names come in config order, so a single indexed pass preserves the previous ordering
+        return [group
+                for name in valid_config_names
+                for group in self._configs_by_name[name].groups]
 
-        groups = []
-        for config in self.configs:
-            if config.name in valid_config_names:
-                groups.extend(config.groups)
-        return groups
+    def _valid_names_only(self,
+                          config_names: _typing.List[str] = []) -> _typing.List[str]:
+        """Helper. Like :py:meth:`~.ComputerOptionsManager._get_valid_config_names_from`, but returns only
+        the valid names, skipping the set differences for the unselected and invalid names.
+
+        :param config_names: selection of config names.
+        :return: valid config names of this manager, in config order.
+        """
+        if not config_names:
+            return self.config_names
+        return [config.name for config in self.configs if config.name in set(config_names)]
 
     def _get_valid_config_names_from(self,
                                      config_names: _typing.List[str] = [],
@@ -1057,10 +1487,18 @@ class ComputerOptionsManager:
         :param silent: True: do not print out any info. False: only print warnings.
         :return: tuple of (valid, unselected, invalid config names) of this config
         """
-        supplied_config_names = config_names or self.config_names
-        valid_config_names = [config.name for config in self.configs if config.name in supplied_config_names]
-        invalid_config_names = list(set(supplied_config_names) - set(valid_config_names))
-        unselected_config_names = list(set(self.config_names) - set(valid_config_names))
+        # memoize per supplied names: methods like get_options may be called in tight loops with
+        # identical selections. only the computation is cached, warnings still respect 'silent'.
+        key = tuple(config_names)
+        cached = self._valid_names_cache.get(key)
+        if cached is not None:
+            valid_config_names, unselected_config_names, invalid_config_names = cached
+        else:
+            supplied_config_names = config_names or self.config_names
+            valid_config_names = [config.name for config in self.configs if config.name in supplied_config_names]
+            invalid_config_names = list(set(supplied_config_names) - set(valid_config_names))
+            unselected_config_names = list(set(self.config_names) - set(valid_config_names))
+            self._valid_names_cache[key] = (valid_config_names, unselected_config_names, invalid_config_names)
 
         if not silent and invalid_config_names:
             print(f"Ignoring invalid config names: {invalid_config_names}.")
@@ -1093,6 +1531,9 @@ class ComputerOptionsManager:
         """
         valid_config_names, unselected_config_names, invalid_config_names = \
             self._get_valid_config_names_from(config_names=config_names, silent=silent)
+        # frozensets for the membership tests below (lists would make the rebuilds quadratic)
+        valid_set = frozenset(valid_config_names)
+        unselected_set = frozenset(unselected_config_names)
 
         if not silent:
             print(f"Initializing computer options configs: {valid_config_names}.")
@@ -1106,20 +1547,19 @@ class ComputerOptionsManager:
                           f"from database, if already stored, dry run: {delete_dry_run}.")
 
                 # not using get_groups() here to suppress not initialized warning
-                groups = []
-                for config in self.configs:
-                    if config.name in unselected_config_names:
-                        groups.extend(config._groups)
-                stored_groups = []
-                for group in groups:
-                    # since we are not necessarily initialized yet, the groups may or may not exist in db.
-                    # so wrap in try except block.
-                    try:
-                        stored_group = _orm.Group.get(label=group.label)
-                        stored_groups.append(stored_group)
-                    except _aiida.common.exceptions.NotExistent as err:
-                        pass
-                _jutools.group.delete_groups_with_nodes(group_labels=[group.label for group in stored_groups],
+                groups = list(_itertools.chain.from_iterable(
+                    config._groups for config in self._configs if config.name in unselected_set))
+                # since we are not necessarily initialized yet, the groups may or may not exist in db.
+                # find the stored ones with one batched label query instead of one Group.get
+                # round trip (plus NotExistent handling) per group.
+                labels = [group.label for group in groups]
+                stored_labels = set()
+                for label_batch in _batch_iter(labels):
+                    qb = _orm.QueryBuilder()
+                    qb.append(_orm.Group, filters={"label": {"in": label_batch}}, project=["label"])
+                    stored_labels.update(qb.all(flat=True))
+                _jutools.group.delete_groups_with_nodes(group_labels=[label for label in labels
+                                                                      if label in stored_labels],
                                                         dry_run=delete_dry_run, verbosity=delete_verbosity,
                                                         leave_groups=False)
 
@@ -1134,13 +1574,17 @@ class ComputerOptionsManager:
                     f"this class to get back the unselected config attributes, then run {method_name} again with "
                     f"delete dry run False.")
         # # then remove unselected configs from instance
-        self._configs[:] = [config for config in self._configs if config.name in valid_config_names]
+        self._configs[:] = [config for config in self._configs if config.name in valid_set]
+        self._configs_by_name = {config.name: config for config in self._configs}
+        self._valid_names_cache.clear()
+        # pop straight from the instance dict; delattr would re-run the full descriptor lookup per name
+        instance_dict = self.__dict__
         for config_name in unselected_config_names:
-            delattr(self, config_name)
+            instance_dict.pop(config_name, None)
 
         # finally, initialize selected configs
         for config in self.configs:
-            if config.name in valid_config_names:
+            if config.name in valid_set:
                 if not config._is_initialized:
                     config.initialize(silent=silent)
                 elif not silent:
@@ -1181,22 +1625,19 @@ class ComputerOptionsManager:
         """
         valid_config_names, _, _ = self._get_valid_config_names_from(config_names=config_names, silent=silent)
 
-        options = []
-        for config in self.configs:
-            if config.name in valid_config_names:
-                options.extend(
-                    config.get_options(store_if_not_exist=store_if_not_exist,
-                                       as_Dict=as_Dict,
-                                       silent=silent,
-                                       computer_name=computer_name,
-                                       gpu=gpu,
-                                       withmpi=withmpi,
-                                       queue_name=queue_name,
-                                       account=account,
-                                       **kwargs)
-                )
-
-        return options
+        # single chained allocation instead of repeated list.extend reallocations
+        return list(_itertools.chain.from_iterable(
+            self._configs_by_name[name].get_options(store_if_not_exist=store_if_not_exist,
+                                                    as_Dict=as_Dict,
+                                                    silent=silent,
+                                                    computer_name=computer_name,
+                                                    gpu=gpu,
+                                                    withmpi=withmpi,
+                                                    queue_name=queue_name,
+                                                    account=account,
+                                                    **kwargs)
+            for name in valid_config_names
+        ))
 
     def get_help(self,
                  mode: str,
@@ -1230,16 +1671,20 @@ class ComputerOptionsManager:
             return self.configs[0].get_help(mode, *args)
 
         if is_mode_keys:
+            key_options = self._help_config.keys_mode_return_key_options
+            key_resources = self._help_config.keys_mode_return_key_rescources
+            # read by key instead of pop: no dict mutation, and the 'is None' check keeps
+            # a legitimately empty keys list from being re-fetched from every config
             all_options_keys = None
             resources_keys = {}
             for config in self.configs:
                 help = config.get_help(mode=mode)
-                if not all_options_keys:
-                    all_options_keys = help.pop(self._help_config.keys_mode_return_key_options)
-                resources_keys[config.name] = help.pop(self._help_config.keys_mode_return_key_rescources)
+                if all_options_keys is None:
+                    all_options_keys = help[key_options]
+                resources_keys[config.name] = help[key_resources]
 
-            return {self._help_config.keys_mode_return_key_options: all_options_keys,
-                    self._help_config.keys_mode_return_key_rescources: resources_keys}
+            return {key_options: all_options_keys,
+                    key_resources: resources_keys}
 
     def delete_options(self,
                        config_names: _typing.List[str] = [],
@@ -1258,9 +1703,10 @@ class ComputerOptionsManager:
         """
         valid_config_names, _, _ = self._get_valid_config_names_from(config_names=config_names, silent=(not verbosity))
 
-        for config in self.configs:
-            if config.name in valid_config_names:
-                config.delete_options(options_nodes=options_nodes, dry_run=dry_run, verbosity=verbosity)
+        for name in valid_config_names:
+            self._configs_by_name[name].delete_options(options_nodes=options_nodes,
+                                                       dry_run=dry_run,
+                                                       verbosity=verbosity)
 
     def add_config(self,
                    config: _OptionsConfig,
@@ -1280,5 +1726,10 @@ class ComputerOptionsManager:
         if initialize:
             config.initialize(silent=silent)
         setattr(self, config.name, config)
+        # keep the configs list and name index in sync (see DEVNOTE in __post_init__)
+        if config.name not in self._configs_by_name:
+            self._configs.append(config)
+        self._configs_by_name[config.name] = config
+        self._valid_names_cache.clear()
         if not silent:
             print(f"Added computer options config: {config.name}.")
@@ -18,19 +18,23 @@ import aiida as _aiida
 from aiida import orm as _orm
 
 
-def get_computers(computer_name_pattern: str = "") -> _typing.List[_orm.Computer]:
+def get_computers(computer_name_pattern: _typing.Union[str, _typing.List[str]] = "") -> _typing.List[_orm.Computer]:
     """Query computer.
 
     :param computer_name_pattern: (sub)string of computer name, case-insensitive, no regex. default = "":
-           get all computers.
+           get all computers. A list of such patterns matches computers whose name contains any of them
+           (single OR-query instead of one query per pattern).
     :return: aiida Computer if unique, list of Computers if not, empty list if no match
     """
     # version compatibility check: old: computer.name, new: computer.label. else error.
     qb = _orm.QueryBuilder()
-    computer = None
+    if isinstance(computer_name_pattern, str):
+        filters = {'name': {'ilike': f"%{computer_name_pattern}%"}}
+    else:
+        filters = {'or': [{'name': {'ilike': f"%{pattern}%"}} for pattern in computer_name_pattern]}
     return qb.append(
         _orm.Computer,
-        filters={'name': {'ilike': f"%{computer_name_pattern}%"}},
+        filters=filters,
     ).all(flat=True)
 
 
@@ -12,6 +12,10 @@
 ###############################################################################
 """Tools for working with AiiDA IO: CIF files."""
 
+import concurrent.futures as _futures
+import multiprocessing as _multiprocessing
+import os as _os
+import types as _types
 import typing as _typing
 from pathlib import Path as _Path
 from pprint import pprint
@@ -23,12 +27,40 @@ from aiida.tools import groups as _aiida_groups
 from aiida_jutools._dev.terminal_colors import *
 from aiida_jutools.structure import analyze_symmetry
 
+# class names used all over the log messages; bound once at import
+_CIF_NAME = _orm.CifData.__name__
+_STRUCT_NAME = _orm.StructureData.__name__
+
+
+def _load_profile_in_worker():
+    """Initializer for conversion worker processes: load the default AiiDA profile.
+
+    Workers are spawned, not forked, so they must not inherit (and thereby share) the parent's
+    database connection; each worker opens its own via a fresh profile load.
+    """
+    _aiida.load_profile()
+
+
+def _convert_cif_to_structure(args: _typing.Tuple[int, dict]) -> int:
+    """Worker for parallel CIF conversion: load CifData by pk, convert, return the structure pk.
+
+    Runs in a separate process; only pks and plain dicts cross the process boundary, since ORM
+    nodes do not pickle.
+
+    :param args: tuple of (CifData pk, conversion settings dict).
+    :return: pk of the converted, stored StructureData node.
+    """
+    cif_pk, settings = args
+    return _orm.load_node(cif_pk).get_structure(**settings).pk
+
+
 class CifImporter:
-    DEFAULT_CONVERSION_SETTINGS = {
+    # read-only view: shared class state, must not be mutated by instances
+    DEFAULT_CONVERSION_SETTINGS = _types.MappingProxyType({
         'converter': 'pymatgen',
         'store': True,
         'primitive_cell': True
-    }
+    })
 
     def __init__(self):
         """
@@ -42,6 +74,9 @@ class CifImporter:
         output format nodes, so you don't have to take care of that manually.
 
         """
+        # label of a cif group this importer filled itself; such a group holds only CifData
+        # by construction. survives _clear: it records database state, not per-run state.
+        self._homogeneous_cif_group_label = None
         self._clear()
 
     def _clear(self):
@@ -52,29 +87,40 @@ class CifImporter:
         self.conversion_settings = None
 
     @staticmethod
-    def from_file(cif_file: _Path,
-                  silent: bool = False) -> _typing.Optional[_orm.CifData]:
+    def from_file(cif_file: _typing.Union[_Path, str],
+                  silent: bool = False,
+                  filename: str = None,
+                  _skip_exists_check: bool = False) -> _typing.Optional[_orm.CifData]:
         """Read CIF file.
 
         Note: no check on CIF file content validity is performed.
 
-        :param cif_file: path to CIF file.
+        :param cif_file: path to CIF file, as Path or plain string. Strings pass straight through
+               without any Path object construction, which matters when importing many files.
         :param silent: Do not print info/warnings.
+        :param filename: file name, if the caller has it at hand already (e.g. from a directory
+               scan); derived from the path otherwise.
+        :param _skip_exists_check: skip the existence check (and its stat call). For callers which
+               already know the file exists, like :py:meth:`~.import_cif_files`.
         :return: unstored CifData node if file ends with ".cif", case-insensitive, else None.
         """
-        if not cif_file.exists():
-            raise FileNotFoundError(f"File {cif_file} does not exist.")
+        path_str = cif_file if isinstance(cif_file, str) else str(cif_file)
+
+        if not _skip_exists_check and not _os.path.exists(path_str):
+            raise FileNotFoundError(f"File {path_str} does not exist.")
 
-        filename = cif_file.name
+        if filename is None:
+            filename = _os.path.basename(path_str)
 
-        if not filename.lower().endswith(".cif"):
+        # lowercase only the suffix instead of allocating a lowered copy of the whole name
+        if filename[-4:].lower() != ".cif":
             if not silent:
-                print(f"Info: File {cif_file.name} does not have .cif extension. I ignore it and return None.")
+                print(f"Info: File {filename} does not have .cif extension. I ignore it and return None.")
             return None
 
         else:
             cif = _orm.CifData()
-            cif.set_file(file=str(cif_file), filename=filename)
+            cif.set_file(file=path_str, filename=filename)
             return cif
 
     def import_cif_files(self,
@@ -88,11 +134,19 @@ class CifImporter:
         :param cif_group_label: if supplied, add CifData nodes to this group. Create if not exist.
         :return: list of unstored CifData nodes, or group with stored CifData nodes, if supplied.
         """
+        # scandir gives name and file type in one syscall per entry, where iterdir plus the
+        # existence check in from_file would stat each entry a second time
         cifs = []
-        for cif_file in cif_files_path.iterdir():
-            cif = self.from_file(cif_file=cif_file, silent=True)
-            if cif:
-                cifs.append(cif)
+        with _os.scandir(cif_files_path) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                if entry.name[-4:].lower() != ".cif":
+                    continue
+                cif = self.from_file(cif_file=entry.path, silent=True, filename=entry.name,
+                                     _skip_exists_check=True)
+                if cif:
+                    cifs.append(cif)
 
         if not cif_group_label:
             return cifs
@@ -104,6 +158,7 @@ class CifImporter:
         cif_group.store()
         cif_group.add_nodes(cifs)
         self.cif_group = cif_group
+        self._homogeneous_cif_group_label = cif_group.label
         return cif_group
 
     def load_or_convert(self, cifgroup_label: str,
@@ -113,7 +168,9 @@ class CifImporter:
                         load_over_create: bool = True,
                         conversion_settings: _orm.Dict = None,
                         dry_run: bool = True,
-                        silent: bool = False) -> _orm.Group:
+                        silent: bool = False,
+                        max_workers: int = None,
+                        parallel_backend: str = 'thread') -> _orm.Group:
         """Load or create group of StructureData nodes from group of CifData nodes.
 
         :param cifgroup_label: group label of CifData group.
@@ -125,6 +182,14 @@ class CifImporter:
         :param conversion_settings: settings arguments supplied to the respective CifData.to_OtherFormat() method.
         :param dry_run: default True: perform a dry run and print what the method *would* do.
         :param silent: default True: if not dry_run do not print info messages.
+        :param max_workers: None or 1: convert sequentially. >1: convert in a worker pool of this
+               size. The pymatgen conversion is CPU-bound and per-CIF independent, so this scales
+               roughly with core count for large groups. Falls back to sequential on failure.
+        :param parallel_backend: pool flavor if max_workers > 1. 'thread': thread pool; much of
+               pymatgen's work is numpy/spglib C code which releases the GIL, and threads have no
+               process spawn or pickling overhead. 'process': process pool, for workloads which
+               stay in pure Python. 'serial': ignore max_workers. Which backend wins depends on
+               the deployment, hence the knob.
         :return: converted group
 
         Note: load_over_create=True does not check an existing StructureData nodes set whether it matches the
@@ -150,11 +215,21 @@ class CifImporter:
 
         def _get_cif_nodes() -> _typing.List[_orm.CifData]:
             self.cif_group = _orm.Group.get(label=cifgroup_label)
-            cifnodes = [node for node in self.cif_group.nodes if isinstance(node, _orm.CifData)]
+            if cifgroup_label == self._homogeneous_cif_group_label:
+                # this importer filled the group itself, so every member is a CifData
+                # by construction: no type filter needed
+                cifnodes = list(self.cif_group.nodes)
+            else:
+                # type filter in SQL: only the CifData rows get fetched and instantiated,
+                # instead of materializing every node in the group
+                qb = _orm.QueryBuilder()
+                qb.append(_orm.Group, filters={'id': self.cif_group.pk}, tag='group')
+                qb.append(_orm.CifData, with_group='group')
+                cifnodes = qb.all(flat=True)
 
             msg = 40 * '-' + '\n'
-            msg += f"Task: Convert {len(cifnodes)} {_orm.CifData.__name__} " \
-                   f"nodes in group '{self.cif_group.label}' to {_orm.StructureData.__name__} nodes." \
+            msg += f"Task: Convert {len(cifnodes)} {_CIF_NAME} " \
+                   f"nodes in group '{self.cif_group.label}' to {_STRUCT_NAME} nodes." \
                    f"\nPerform dry run: {dry_run}.\n"
             if not cifnodes:
                 msg += "Nothing to convert. Done."
@@ -180,14 +255,16 @@ class CifImporter:
             struc_group = None
 
             msg = ""
-            # find out if structure group exists or not
-            exists = True
-            try:
-                struc_group = _orm.Group.get(label=struc_grouppath.path)
-            except _aiida.common.exceptions.NotExistent as err:
-                exists = False
+            # find out if structure group exists or not. a query instead of Group.get's
+            # try/except NotExistent: no exception control flow on the common miss path
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={'label': struc_grouppath.path})
+            row = qb.first()
+            exists = row is not None
+            if exists:
+                struc_group = row[0]
             load_or_create = "load existing" if exists else "create new"
-            msg += f"I {would_or_will} {load_or_create} {_orm.StructureData.__name__} group '{struc_grouppath.path}'."
+            msg += f"I {would_or_will} {load_or_create} {_STRUCT_NAME} group '{struc_grouppath.path}'."
 
             if dry_run or not silent:
                 print(msg)
@@ -201,12 +278,33 @@ class CifImporter:
 
             self.struc_group = struc_group
 
-        def _load_or_create_conversion_settings() -> None:
+        def _fetch_structure_group_nodes() -> _typing.Tuple[_typing.List[_orm.Dict],
+                                                            _typing.List[_orm.StructureData]]:
+            """One pass over the structure group, bucketing nodes locally by type.
+
+            Both the conversion settings lookup and the pre-existing structures check read from
+            these buckets, so the group is queried once instead of once per consumer.
+            """
+            dict_nodes = []
+            structure_nodes = []
+            if self.struc_group:
+                qb = _orm.QueryBuilder()
+                qb.append(_orm.Group, filters={'id': self.struc_group.pk}, tag='group')
+                qb.append(_orm.Node, with_group='group')
+                for node in qb.all(flat=True):
+                    # exact type keeps the former type == Dict semantics for conversion settings
+                    if type(node) is _orm.Dict:
+                        dict_nodes.append(node)
+                    elif isinstance(node, _orm.StructureData):
+                        structure_nodes.append(node)
+            return dict_nodes, structure_nodes
+
+        def _load_or_create_conversion_settings(dict_nodes: _typing.List[_orm.Dict]) -> dict:
             def _try_load_conversion_settings(struc_group: _orm.Group):
                 if not struc_group:
                     return None
                 else:
-                    hits = [node for node in struc_group.nodes if type(node) == _orm.Dict]
+                    hits = dict_nodes
                     if len(hits) > 1:
                         raise ValueError(
                             f"I found more than one conversion settings node in group '{struc_group.label}'. "
@@ -227,10 +325,20 @@ class CifImporter:
                     convset_node = conversion_settings
                     msg += f" Conversion settings were passed as argument:"
                 else:
-                    convset_node = _orm.Dict(dict=self.DEFAULT_CONVERSION_SETTINGS)
+                    if dry_run:
+                        # lightweight stand-in: the dry-run preview only reads pk, attributes and
+                        # is_stored, so skip the ORM node allocation and session registration
+                        convset_node = _types.SimpleNamespace(pk=None,
+                                                              attributes=dict(self.DEFAULT_CONVERSION_SETTINGS),
+                                                              is_stored=False)
+                    else:
+                        convset_node = _orm.Dict(dict=dict(self.DEFAULT_CONVERSION_SETTINGS))
                     msg += f" Conversion settings were not passed as argument. I {would_or_will} use the " \
                            f"default conversion settings:"
-            msg += f"\nConversion settings node pk: {convset_node.pk}, settings:\n{convset_node.attributes}"
+            # read the attributes once; on stored nodes each access re-deserializes them.
+            # the cached dict serves both the message here and the check below.
+            attrs = dict(convset_node.attributes)
+            msg += f"\nConversion settings node pk: {convset_node.pk}, settings:\n{attrs}"
 
             if dry_run or not silent:
                 print(msg)
@@ -240,14 +348,15 @@ class CifImporter:
                 pass
 
             self.conversion_settings = convset_node
+            return attrs
 
-        def _check_conversion_settings() -> None:
+        def _check_conversion_settings(attrs: dict) -> None:
             msg = ""
 
             setting_key = 'store'
             setting_should = True
-            setting_is = self.conversion_settings.attributes.get(setting_key, None)
-            reason_for_requirement = f"\nReason for requirement: If new {_orm.StructureData.__name__} nodes get " \
+            setting_is = attrs.get(setting_key, None)
+            reason_for_requirement = f"\nReason for requirement: If new {_STRUCT_NAME} nodes get " \
                                      f"created instead of loaded, adding them to the structure group " \
                                      f"{would_or_will} fail."
             if setting_is is not None and not (setting_is == setting_should):
@@ -265,17 +374,19 @@ class CifImporter:
                 print(msg)
 
         def _load_or_convert(cif_nodes: _typing.List[_orm.CifData],
-                             struc_grouppath: _aiida_groups.GroupPath) -> _typing.List[_orm.StructureData]:
+                             struc_grouppath: _aiida_groups.GroupPath,
+                             existing_structure_nodes: _typing.List[_orm.StructureData]
+                             ) -> _typing.List[_orm.StructureData]:
 
             msg = ""
             structure_nodes = None
 
             if self.struc_group:
-                structure_nodes = [node for node in self.struc_group.nodes if isinstance(node, _orm.StructureData)]
+                structure_nodes = existing_structure_nodes
 
             if load_over_create and structure_nodes:
-                msg += f"Found {len(structure_nodes)} pre-existing {_orm.StructureData.__name__} nodes in " \
-                       f"{_orm.StructureData.__name__} group '{self.struc_group.label}'.\nI will not perform any " \
+                msg += f"Found {len(structure_nodes)} pre-existing {_STRUCT_NAME} nodes in " \
+                       f"{_STRUCT_NAME} group '{self.struc_group.label}'.\nI will not perform any " \
                        f"conversion."
 
                 if dry_run or not silent:
@@ -285,7 +396,7 @@ class CifImporter:
             else:
                 # DEVNOTE: for structure group node label, we use the grouppath here because dry_run distinction
                 # leaves possibility that structure group doesn't exit yet.
-                msg += f"I {would_or_will} perform the {_orm.CifData.__name__} -> {_orm.StructureData.__name__} " \
+                msg += f"I {would_or_will} perform the {_CIF_NAME} -> {_STRUCT_NAME} " \
                        f"conversion now and add the converted nodes to the group '{struc_grouppath.path}', " \
                        f"along with the conversion settings node."
                 if dry_run or not silent:
@@ -297,7 +408,41 @@ class CifImporter:
                         self.conversion_settings.store()
                         self.struc_group.add_nodes([self.conversion_settings])
 
-                    structure_nodes = [cif.get_structure(**self.conversion_settings) for cif in cif_nodes]
+                    structure_nodes = None
+                    if max_workers and max_workers > 1 and parallel_backend != 'serial':
+                        settings_dict = dict(self.conversion_settings)
+                        try:
+                            if parallel_backend == 'thread':
+                                # shared session, no spawn or pickling cost; the GIL is released
+                                # inside pymatgen's numpy/spglib core for most of the work
+                                with _futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                                    structure_nodes = list(pool.map(
+                                        lambda cif: cif.get_structure(**settings_dict), cif_nodes))
+                            elif parallel_backend == 'process':
+                                # each worker converts (and stores) independently and hands back
+                                # only the pk; the group gets filled from the main process
+                                # afterwards, so the parent's session never crosses a process
+                                # boundary
+                                with _futures.ProcessPoolExecutor(
+                                        max_workers=max_workers,
+                                        mp_context=_multiprocessing.get_context('spawn'),
+                                        initializer=_load_profile_in_worker) as pool:
+                                    chunksize = max(1, len(cif_nodes) // (4 * max_workers))
+                                    structure_pks = list(pool.map(_convert_cif_to_structure,
+                                                                  ((cif.pk, settings_dict) for cif in cif_nodes),
+                                                                  chunksize=chunksize))
+                                structure_nodes = [_orm.load_node(pk) for pk in structure_pks]
+                            else:
+                                # print this even if silent
+                                print(f"Warning: Unknown {parallel_backend=}. "
+                                      f"Converting sequentially.")
+                        except Exception as err:  # pylint: disable=broad-except
+                            # print this even if silent
+                            print(f"Warning: Parallel conversion failed ({err!r}). "
+                                  f"Falling back to sequential conversion.")
+                            structure_nodes = None
+                    if structure_nodes is None:
+                        structure_nodes = [cif.get_structure(**self.conversion_settings) for cif in cif_nodes]
                     self.struc_group.add_nodes(structure_nodes)
                     if not dry_run:
                         # print this even if silent
@@ -311,9 +456,9 @@ class CifImporter:
                                    structure_nodes: _typing.List[_orm.StructureData]) -> None:
             if structure_nodes and (not len(cif_nodes) == len(structure_nodes)):
                 # print this even if silent
-                print(f"Warning: The {_orm.CifData.__name__} group '{self.cif_group.label}' has {len(cif_nodes)} "
-                      f"{_orm.CifData.__name__} nodes, but the {_orm.StructureData.__name__} group "
-                      f"'{struc_grouppath.path}' has {len(structure_nodes)} {_orm.StructureData.__name__} nodes. "
+                print(f"Warning: The {_CIF_NAME} group '{self.cif_group.label}' has {len(cif_nodes)} "
+                      f"{_CIF_NAME} nodes, but the {_STRUCT_NAME} group "
+                      f"'{struc_grouppath.path}' has {len(structure_nodes)} {_STRUCT_NAME} nodes. "
                       f"It is recommended to keep a one-to-one node-to-node conversion relation between such "
                       f"conversion groups to corectly reflect provenance.")
 
@@ -321,9 +466,11 @@ class CifImporter:
         if cif_nodes:
             struc_grouppath = _determine_structure_group_path(structure_group_label=structure_group_label)
             _load_or_create_structure_group(struc_grouppath=struc_grouppath)
-            _load_or_create_conversion_settings()
-            _check_conversion_settings()
-            struc_nodes = _load_or_convert(cif_nodes=cif_nodes, struc_grouppath=struc_grouppath)
+            dict_nodes, existing_struc_nodes = _fetch_structure_group_nodes()
+            convset_attrs = _load_or_create_conversion_settings(dict_nodes=dict_nodes)
+            _check_conversion_settings(attrs=convset_attrs)
+            struc_nodes = _load_or_convert(cif_nodes=cif_nodes, struc_grouppath=struc_grouppath,
+                                           existing_structure_nodes=existing_struc_nodes)
             _post_conversion_check(cif_nodes=cif_nodes, struc_grouppath=struc_grouppath, structure_nodes=struc_nodes)
 
         return self.struc_group
@@ -14,9 +14,11 @@
 """Tools for working with AiiDA IO: tabulation: Tabulator."""
 
 import abc as _abc
-import copy as _copy
+import collections as _collections
+import concurrent.futures as _futures
 import json
 import json as _json
+import sys as _sys
 import typing as _typing
 
 import aiida.orm as _orm
@@ -26,6 +28,14 @@ from masci_tools.io.parsers.tabulator import Recipe, Tabulator, TransformedValue
 
 import aiida_jutools as _jutools
 
+# attribute names with special link-traversal handling in NodeTabulator.autolist
+_IO_ATTR_NAMES = frozenset({'inputs', 'outputs'})
+
+
+def _null_transform(_v):
+    """Value transform for skeleton building: maps every leaf to ``None``."""
+    return None
+
 
 class NodeTabulator(Tabulator):
     """For tabulation of a collection of nodes' (of same type) properties into a dict or dataframe.
@@ -44,20 +54,17 @@ class NodeTabulator(Tabulator):
     In the transformer, a higher-level nested property may shadow subproperties such that they do not get
     unpacked or transformed.
 
+    While building, the internal storage format is a dict of plain lists. When a tabulation is finished, the
+    columns get converted to compact typed arrays (see :py:meth:`~._compact_columns`): numeric columns are
+    downcast to the smallest fitting dtype, low-cardinality string columns become categoricals. If the recipe
+    supplies a ``dtypes`` dict (column name -> dtype), those take precedence over the automatic conversion.
+
+    For large collections, prefer :py:meth:`~.build` plus a single access of the :py:attr:`~.table` property:
+    the property releases the internal storage on hand-over, so source columns and returned DataFrame do not
+    stay resident together. :py:meth:`~.tabulate` remains as build-and-return in one call.
+
     TODO: increase memory performance:
 
-    - use optional dtypes from recipe (see TODO in Recipe) when building table. otherwise, e.g. when returning
-      pandas dataframe, all columns will have dtype 'object' or 'float64' and the table won't fit into memory
-      anymore very quickly.
-    - internal storage format dict of lists while building must remain, but when finished, convert to dict
-      of numpy arrays -> more memory efficient. for repeated tabulate() calls (to build larger table), have
-      to adjust code to concatenate new lists to existing numpy arrays when finished.
-    - change tabulate() signature: should not return table, only build it. another method (e.g. table @property
-      getter) should return table and before del (delete) its inner storage (self._table) of it, because return
-      will likely create a copy. that way can ~half the memory footprint.
-    - when returning pandas dataframe, and recipe supplied no dtypes, use automatic downcasting to smallest dtype
-      for numeric types (pd.to_numeric), and maybe 'categorical' for string coluns (if num unique values << num
-      values). See pandas > Scaling to larg datasets for more.
     - maybe add save option (or method) and read() method to read in tabulated table. for pandas, that allow a user
       to easily reuse the dtypes information from the recipe.
     """
@@ -131,6 +138,23 @@ class NodeTabulator(Tabulator):
             'outputs': 3
         }
 
+        # flat, immutable view of the search paths for the autolist loop
+        self._compile_autolist_search_paths()
+
+        # skeleton cache for autolist: dicts from the same link label usually share a schema,
+        # so the None-leaf structure is computed once per (unpack level, key signature)
+        self._modify_dict_cache = {}
+
+    def _compile_autolist_search_paths(self):
+        """Precompile the search paths dict into a flat tuple of (node type, attribute names) pairs.
+
+        Saves the per-call dict iteration and re-tupling in :py:meth:`~.autolist`.
+        """
+        # attr names double as table column names; interned, all later key copies share one object
+        self._autolist_search_paths_compiled = tuple(
+            (node_type, tuple(_sys.intern(attr_name) for attr_name in attr_names))
+            for node_type, attr_names in self._autolist_search_paths.items())
+
     @property
     def autolist_search_paths(self) -> _typing.Dict[_typing.Type[_orm.Node], _typing.List[str]]:
         """The autolist search paths is a list of node types and top-level property string names
@@ -145,6 +169,7 @@ class NodeTabulator(Tabulator):
         assert all(isinstance(value, list) for value in search_paths.values())
 
         self._autolist_search_paths = search_paths
+        self._compile_autolist_search_paths()
 
     @property
     def autolist_unpack_levels(self) -> _typing.Dict[_typing.Any, int]:
@@ -160,6 +185,49 @@ class NodeTabulator(Tabulator):
 
         self._autolist_unpack_levels = unpack_levels
 
+    @staticmethod
+    def _get_io_dict_attributes(node: _orm.Node,
+                                incoming: bool) -> _typing.List[_typing.Tuple[dict, str]]:
+        """Attributes and link label of a node's incoming or outgoing :py:class:`~aiida.orm.Dict` nodes.
+
+        A single projection query fetching only link label and attributes, instead of a
+        ``get_incoming``/``get_outgoing`` traversal which materializes every linked node in full.
+
+        :param node: the node whose linked Dict nodes to fetch.
+        :param incoming: True: incoming (input) Dict nodes. False: outgoing (output) Dict nodes.
+        :return: list of (attributes dict, link label) tuples.
+        """
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.Node, filters={'id': node.pk}, tag='src')
+        if incoming:
+            qb.append(_orm.Dict, with_outgoing='src', project=['attributes'], edge_project=['label'])
+        else:
+            qb.append(_orm.Dict, with_incoming='src', project=['attributes'], edge_project=['label'])
+        return qb.all()
+
+    def _dict_skeleton(self,
+                       a_dict: dict,
+                       to_level: int) -> dict:
+        """Structure of a dict up to the given nesting level, with all leaves set to ``None``.
+
+        Memoized on a shallow structural signature (unpack level plus top-level keys and value
+        types), since e.g. the ``output_parameters`` Dicts of a group of workchains all share the
+        same schema. A cache hit returns a shallow copy; that is safe because the skeleton's
+        nested dicts are never mutated downstream.
+
+        :param a_dict: the dict whose skeleton to build.
+        :param to_level: nesting level down to which to unpack.
+        :return: skeleton dict with ``None`` leaves.
+        """
+        key = (to_level, frozenset((k, type(v).__name__) for k, v in a_dict.items()))
+        skeleton = self._modify_dict_cache.get(key)
+        if skeleton is None:
+            skeleton = _masci_python_util.modify_dict(a_dict=a_dict,
+                                                      transform_value=_null_transform,
+                                                      to_level=to_level)
+            self._modify_dict_cache[key] = skeleton
+        return dict(skeleton)
+
     def autolist(self,
                  obj: _orm.Node,
                  overwrite: bool = False,
@@ -181,7 +249,11 @@ class NodeTabulator(Tabulator):
 
         include_list = {}
 
-        for node_type, attr_names in self._autolist_search_paths.items():
+        # bind loop-invariant lookups once; a single LOAD_FAST per use in the loops below
+        unpack_levels = self._autolist_unpack_levels
+        dict_skeleton = self._dict_skeleton
+
+        for node_type, attr_names in self._autolist_search_paths_compiled:
             if isinstance(node, node_type):
                 for attr_name in attr_names:
                     try:
@@ -190,51 +262,47 @@ class NodeTabulator(Tabulator):
                         print(f"Warning: Could not get attr '{attr_name}'. Skipping.")
                         continue
 
-                    is_inputs = attr_name == 'inputs'
-                    is_outputs = attr_name == 'outputs'
-                    is_dict = isinstance(attr, (dict, _orm.Dict)) and attr_name not in ['inputs', 'outputs']
-                    is_special = (is_dict or is_inputs or is_outputs)
-
-                    if not is_special:
-                        include_list[attr_name] = None
-                        continue
-
-                    # now handle the special cases
-
-                    if is_dict:
-                        # for instance: node.extras.
-                        # note: in future, could use ExtraForm sets here for standardized extras.
-                        # get dict structure up to the specified unpacking leve
-                        is_aiida_dict = isinstance(attr, _orm.Dict)
-                        attr = attr.attributes if is_aiida_dict else attr
-
-                        to_level = self.autolist_unpack_levels[type(attr)]
-                        props = _masci_python_util.modify_dict(a_dict=attr,
-                                                               transform_value=lambda v: None,
-                                                               to_level=to_level)
-                        if is_aiida_dict:
-                            include_list[attr_name] = {'attributes': _copy.deepcopy(props)}
-                        else:
-                            include_list[attr_name] = _copy.deepcopy(props)
-
-                    if is_inputs or is_outputs:
-                        # get all Dict output link triples
-                        link_triples = node.get_incoming(node_class=_orm.Dict).all() \
-                            if is_inputs else node.get_outgoing(node_class=_orm.Dict).all()
-
-                        # Now get all keys in all input/output `Dicts`, sorted alphabetically.
-                        all_io_dicts = {lt.link_label: lt.node.attributes for lt in link_triples}
-
-                        # now get structure for all the inputs/outputs
-                        in_or_out = 'inputs' if is_inputs else 'outputs'
-                        to_level = self.autolist_unpack_levels[in_or_out]
-                        props = {
-                            link_label: _masci_python_util.modify_dict(a_dict=out_dict,
-                                                                       transform_value=lambda v: None,
-                                                                       to_level=to_level)
-                            for link_label, out_dict in all_io_dicts.items()
+                    # the name test comes first so the common case, a plain scalar attr, falls
+                    # through to the else with a single frozenset lookup plus the type checks,
+                    # without building any helper booleans
+                    if attr_name in _IO_ATTR_NAMES:
+                        is_inputs = attr_name == 'inputs'
+
+                        # get link label and attributes of all input/output Dict nodes in one
+                        # projection query (no full link-triple materialization)
+                        io_dict_attributes = self._get_io_dict_attributes(node=node, incoming=is_inputs)
+
+                        # now get structure for all the inputs/outputs. The skeletons are fresh
+                        # None-leaf dicts (see _dict_skeleton), built here straight from the
+                        # projected rows without the intermediate link_label : attributes dict.
+                        to_level = unpack_levels[attr_name]
+                        # link labels come back from the query as fresh strings; intern them so
+                        # every later dict keyed on them shares one object per label
+                        include_list[attr_name] = {
+                            _sys.intern(link_label): dict_skeleton(a_dict=attributes, to_level=to_level)
+                            for attributes, link_label in io_dict_attributes
                         }
-                        include_list[attr_name] = _copy.deepcopy(props)
+                    else:
+                        # exact-type checks first: they skip the MRO walk isinstance does for the
+                        # common cases (plain dict, orm.Dict), and double as the dict-kind dispatch
+                        attr_type = type(attr)
+                        is_aiida_dict = attr_type is _orm.Dict or isinstance(attr, _orm.Dict)
+                        if is_aiida_dict or attr_type is dict or isinstance(attr, dict):
+                            # for instance: node.extras.
+                            # note: in future, could use ExtraForm sets here for standardized extras.
+                            # get dict structure up to the specified unpacking leve
+                            attr = attr.attributes if is_aiida_dict else attr
+
+                            # the skeleton is a fresh dict with None leaves, so it can be stored
+                            # directly: deep-copying it again would just re-walk the whole tree
+                            to_level = unpack_levels[type(attr)]
+                            props = dict_skeleton(a_dict=attr, to_level=to_level)
+                            if is_aiida_dict:
+                                include_list[attr_name] = {'attributes': props}
+                            else:
+                                include_list[attr_name] = props
+                        else:
+                            include_list[attr_name] = None
 
         if pretty_print:
             print(_json.dumps(include_list,
@@ -243,56 +311,112 @@ class NodeTabulator(Tabulator):
         if overwrite or not self.recipe.include_list:
             self.recipe.include_list = include_list
 
+    @staticmethod
+    def _compact_columns(table: dict,
+                         dtypes: dict = None) -> dict:
+        """Convert a finished dict-of-lists table to compact typed column arrays.
+
+        Numeric columns are downcast to the smallest fitting dtype, string columns with few unique values
+        become pandas categoricals; columns of mixed or unhashable values stay as they are. Recipe-supplied
+        dtypes take precedence over the automatic conversion.
+
+        :param table: dict column name -> list of values.
+        :param dtypes: optional dict column name -> dtype, applied verbatim.
+        :return: dict column name -> typed column array.
+        """
+        dtypes = dtypes or {}
+        compact = {}
+        for column, values in table.items():
+            series = _pd.Series(values)
+            if column in dtypes:
+                compact[column] = series.astype(dtypes[column]).array
+                continue
+            if series.dtype == object:
+                try:
+                    series = _pd.to_numeric(series)
+                except (ValueError, TypeError):
+                    num_values = len(series)
+                    try:
+                        if num_values and series.nunique(dropna=True) / num_values < 0.5:
+                            series = series.astype('category')
+                    except TypeError:
+                        # unhashable values (lists, dicts): keep object column
+                        pass
+            if _pd.api.types.is_numeric_dtype(series) and not _pd.api.types.is_bool_dtype(series):
+                downcast = 'integer' if _pd.api.types.is_integer_dtype(series) else 'float'
+                series = _pd.to_numeric(series, downcast=downcast)
+            compact[column] = series.array
+        return compact
+
     def clear(self):
         """Clear table if already tabulated."""
         self._table = {}
 
     @property
     def table(self) -> _typing.Optional[_pd.DataFrame]:
-        """The result table. None if :py:meth:`~tabulate` not yet called."""
-        return _pd.DataFrame.from_dict(self._table) if self._table else None
+        """The result table as pandas DataFrame. None if nothing tabulated yet.
 
-    def tabulate(self,
-                 collection: _typing.Union[_typing.List[_orm.Node], _orm.Group],
-                 table_type: _typing.Union[_typing.Type[dict], _typing.Type[_pd.DataFrame]] = _pd.DataFrame,
-                 append: bool = True,
-                 column_policy: str = 'flat',
-                 pass_node_to_transformer: bool = True,
-                 drop_empty_columns: bool = True,
-                 verbose: bool = True,
-                 **kwargs) -> _typing.Union[None, dict, _pd.DataFrame]:
-        """This method extends :py:meth:`~.Tabulator.tabulate`. See also its docstring.
+        Accessing the property hands the tabulated data over: the internal storage is released before
+        returning, so the source columns and the returned DataFrame are not resident simultaneously
+        (roughly halving the peak memory of the hand-over). To keep appending via
+        :py:meth:`~.build` afterwards, do not access the table in between.
+        """
+        if not self._table:
+            return None
+        df = _pd.DataFrame.from_dict(self._table)
+        self._table = {}
+        return df
+
+    def build(self,
+              collection: _typing.Union[_typing.List[_orm.Node], _orm.Group],
+              append: bool = True,
+              column_policy: str = 'flat',
+              pass_node_to_transformer: bool = True,
+              drop_empty_columns: bool = True,
+              verbose: bool = True,
+              max_workers: int = None,
+              **kwargs):
+        """Build the table from a collection of nodes, without returning it.
+
+        Retrieve the result via the :py:attr:`~.table` property (as DataFrame; releases the internal
+        storage) or keep calling this method with ``append=True`` to grow the table first.
 
         For unpacking standardized extras, .:py:class:`~aiida_jutools.meta.extra.ExtraForm` sets may be used.
 
-        :param collection: group or list of nodes.
-        :param table_type: table as pandas DataFrame or dict.
+        :param collection: group or list of nodes. A group is streamed in a single pass, its node
+                           list is never materialized in full.
         :param append: True: append to table if not empty. False: Overwrite table.
-        :param column_policy: 'flat': Flat table, column names are last keys per keypath, name conflicts produce 
-                              warnings. 'flat_full_path': Flat table, column names are full keypaths, 
-                              'multiindex': table with MultiIndex columns (if pandas: `MultiIndex` columns), reflecting 
+        :param column_policy: 'flat': Flat table, column names are last keys per keypath, name conflicts produce
+                              warnings. 'flat_full_path': Flat table, column names are full keypaths,
+                              'multiindex': table with MultiIndex columns (if pandas: `MultiIndex` columns), reflecting
                               the full properties' keypath hierarchies.
         :param pass_node_to_transformer: True: Pass current node to transformer. Enables more complex transformations,
                                          but may be slower for large collections.
         :param drop_empty_columns: Drop None/NaN-only columns. These could
         :param verbose: True: Print warnings.
+        :param max_workers: None or 1: process nodes sequentially. >1: build rows in a thread pool of
+                            this size. Worthwhile for large collections, since row building is mostly
+                            waiting on database fetches. Falls back to sequential if the storage
+                            backend turns out not to be thread-safe.
         :param kwargs: Additional keyword arguments for subclasses.
-        :return: Tabulated objects' properties as dict or pandas DataFrame.
         """
 
-        def _process_node(_node,
-                          _table,
-                          _include_keypaths,
-                          _pass_node_to_transformer,
-                          _failed_paths,
-                          _failed_transforms,
-                          **kwargs):
+        # bind the value fetch to a local once; the lazy-package attribute chain would
+        # otherwise be re-resolved per keypath per node in the loop below
+        _get_from_nested_node = _jutools.node.get_from_nested_node
+
+        def _build_row(_node,
+                       _include_keypaths,
+                       _pass_node_to_transformer,
+                       _failed_paths,
+                       _failed_transforms,
+                       **kwargs):
             row = {keypath[-1]: None for keypath in _include_keypaths}
 
             for keypath in _include_keypaths:
                 column = keypath[-1]
-                value, err = _jutools.node.get_from_nested_node(node=_node,
-                                                                keypath=keypath)
+                value, err = _get_from_nested_node(node=_node,
+                                                   keypath=keypath)
                 if err:
                     row[column] = None
                     _failed_paths[tuple(keypath)].append(_node.uuid)
@@ -319,20 +443,25 @@ class NodeTabulator(Tabulator):
                         _failed_transforms[tuple(keypath)].append(_node.uuid)
                         continue
 
+            return row
+
+        def _append_row(_table,
+                        row,
+                        _nonnull_counts=None):
             for column, value in row.items():
                 # if transformer created new columns in row, need to add them here as well first.
                 if column not in _table:
-                    _table[column] = []
+                    _table[_sys.intern(column)] = []
                 _table[column].append(value)
-
-        if table_type not in self._table_types:
-            print(f"Warning: Unknown {table_type=}. Choosing default return type "
-                  f"{_pd.DataFrame} instead.")
-            table_type = _pd.DataFrame
-
-        if table_type == _pd.DataFrame and verbose \
-                and (column_policy not in self._column_policies
-                     or column_policy in {'flat_full_path', 'multiindex'}):
+                # count non-null (and, for float scalars, non-NaN) values as we go, so dropping
+                # empty columns later needs no second pass over the whole table. The NaN test
+                # stays scalar-only: array-valued cells have no single truth value.
+                if _nonnull_counts is not None and value is not None \
+                        and not (isinstance(value, float) and value != value):
+                    _nonnull_counts[column] += 1
+
+        if verbose and (column_policy not in self._column_policies
+                        or column_policy in {'flat_full_path', 'multiindex'}):
             print(f"Warning: Unknown pandas column policy '{column_policy}'. Will switch to "
                   f"default policy 'flat'.")
             column_policy = 'flat'
@@ -430,13 +559,13 @@ class NodeTabulator(Tabulator):
                     # now we can finally build the table
                 failed_paths = {tuple(keypath): [] for keypath in include_keypaths}
                 failed_transforms = {tuple(keypath): [] for keypath in include_keypaths}
-                _process_node(_node=node,
-                              _table=table,
-                              _include_keypaths=include_keypaths,
-                              _pass_node_to_transformer=pass_node_to_transformer,
-                              _failed_paths=failed_paths,
-                              _failed_transforms=failed_transforms,
-                              **kwargs)
+                _append_row(table,
+                            _build_row(_node=node,
+                                       _include_keypaths=include_keypaths,
+                                       _pass_node_to_transformer=pass_node_to_transformer,
+                                       _failed_paths=failed_paths,
+                                       _failed_transforms=failed_transforms,
+                                       **kwargs))
             else:
                 pass
             existing_table_columns = set(self._table.keys())
@@ -452,19 +581,46 @@ class NodeTabulator(Tabulator):
         table = {keypath[-1]: [] for keypath in include_keypaths}
         failed_paths = {tuple(keypath): [] for keypath in include_keypaths}
         failed_transforms = {tuple(keypath): [] for keypath in include_keypaths}
-        generator = (node for node in group.nodes) if is_group else (node for node in nodes)
+        # iterate the group's lazy node iterator directly instead of re-wrapping it in a
+        # generator expression; the collection is consumed in a single pass either way
+        generator = iter(group.nodes) if is_group else iter(nodes)
 
-        for node in generator:
-            _process_node(_node=node,
-                          _table=table,
-                          _include_keypaths=include_keypaths,
-                          _pass_node_to_transformer=pass_node_to_transformer,
-                          _failed_paths=failed_paths,
-                          _failed_transforms=failed_transforms,
-                          **kwargs)
+        def _build_row_for(_node):
+            return _build_row(_node=_node,
+                              _include_keypaths=include_keypaths,
+                              _pass_node_to_transformer=pass_node_to_transformer,
+                              _failed_paths=failed_paths,
+                              _failed_transforms=failed_transforms,
+                              **kwargs)
+
+        rows = None
+        if max_workers and max_workers > 1:
+            # row building is dominated by per-node DB fetches, so threads overlap the SQL
+            # waits; pool.map preserves collection order, and the sequential append below
+            # keeps the table columns single-threaded.
+            try:
+                with _futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    rows = list(pool.map(_build_row_for, generator))
+            except Exception as err:  # pylint: disable=broad-except
+                # e.g. a storage backend whose session is not thread-safe
+                if verbose:
+                    print(f"Warning: Parallel tabulation failed ({err!r}). Falling back to sequential run.")
+                rows = None
+                # the generator may be partially consumed and the failure bookkeeping partially
+                # filled; restart both from scratch
+                failed_paths = {tuple(keypath): [] for keypath in include_keypaths}
+                failed_transforms = {tuple(keypath): [] for keypath in include_keypaths}
+                generator = iter(group.nodes) if is_group else iter(nodes)
+
+        if rows is None:
+            rows = (_build_row_for(node) for node in generator)
+
+        nonnull_counts = _collections.defaultdict(int)
+        for row in rows:
+            _append_row(table, row, nonnull_counts)
 
         if drop_empty_columns:
-            empty_columns = [colname for colname, values in table.items() if all(v is None for v in values)]
+            empty_columns = [colname for colname in table if nonnull_counts[colname] == 0]
             if empty_columns:
                 if verbose:
                     print(f"Info: Deleting empty columns {empty_columns}.")
@@ -484,15 +640,60 @@ class NodeTabulator(Tabulator):
                 print(f"Warning: Failed to transform keypath values for some nodes:\n"
                       f"{json.dumps(failed_transforms, indent=4)}")
 
+        # convert the finished columns from plain lists to compact typed arrays
+        table = self._compact_columns(table, dtypes=getattr(self.recipe, 'dtypes', None))
         if append and self._table:
             for column, new_values in table.items():
-                self._table[column].extend(new_values)
+                # stored columns are typed arrays, so concatenate instead of list-extend
+                self._table[column] = _pd.concat([_pd.Series(self._table[column]),
+                                                  _pd.Series(new_values)],
+                                                 ignore_index=True).array
         else:
             self._table = table
 
-        if table_type == _pd.DataFrame:
-            return self.table
-        elif table_type == dict:
+    def tabulate(self,
+                 collection: _typing.Union[_typing.List[_orm.Node], _orm.Group],
+                 table_type: _typing.Union[_typing.Type[dict], _typing.Type[_pd.DataFrame]] = _pd.DataFrame,
+                 append: bool = True,
+                 column_policy: str = 'flat',
+                 pass_node_to_transformer: bool = True,
+                 drop_empty_columns: bool = True,
+                 verbose: bool = True,
+                 **kwargs) -> _typing.Union[None, dict, _pd.DataFrame]:
+        """This method extends :py:meth:`~.Tabulator.tabulate`. See also its docstring.
+
+        Backward-compatible wrapper around :py:meth:`~.build` plus a return value. Unlike the
+        :py:attr:`~.table` property, the returned table leaves the internal storage intact, so
+        repeated append-mode calls keep working; for the memory-friendly hand-over, use
+        :py:meth:`~.build` and access :py:attr:`~.table` once at the end instead.
+
+        :param collection: group or list of nodes.
+        :param table_type: table as pandas DataFrame or dict.
+        :param append: True: append to table if not empty. False: Overwrite table.
+        :param column_policy: 'flat': Flat table, column names are last keys per keypath, name conflicts produce
+                              warnings. 'flat_full_path': Flat table, column names are full keypaths,
+                              'multiindex': table with MultiIndex columns (if pandas: `MultiIndex` columns), reflecting
+                              the full properties' keypath hierarchies.
+        :param pass_node_to_transformer: True: Pass current node to transformer. Enables more complex transformations,
+                                         but may be slower for large collections.
+        :param drop_empty_columns: Drop None/NaN-only columns. These could
+        :param verbose: True: Print warnings.
+        :param kwargs: Additional keyword arguments for subclasses.
+        :return: Tabulated objects' properties as dict or pandas DataFrame.
+        """
+        if table_type not in self._table_types:
+            print(f"Warning: Unknown {table_type=}. Choosing default return type "
+                  f"{_pd.DataFrame} instead.")
+            table_type = _pd.DataFrame
+
+        self.build(collection,
+                   append=append,
+                   column_policy=column_policy if table_type == _pd.DataFrame else 'flat',
+                   pass_node_to_transformer=pass_node_to_transformer,
+                   drop_empty_columns=drop_empty_columns,
+                   verbose=verbose,
+                   **kwargs)
+
+        if table_type == dict:
             return self._table
-        else:
-            raise NotImplementedError(f"Table type {table_type} not supported.")
+        return _pd.DataFrame.from_dict(self._table) if self._table else None
@@ -11,22 +11,34 @@
 #                                                                             #
 ###############################################################################
 """Tools for working with aiida-kkr nodes: constants."""
-import collections as _collections
+import concurrent.futures as _futures
 import datetime as _datetime
 import enum as _enum
 import os as _os
+import re as _re
+import types as _types
 import typing as _typing
 
 import numpy as _np
 import pandas as _pd
 import pytz as _pytz
 from aiida import orm as _orm
+from aiida.manage.manager import get_manager as _get_manager
 from aiida_kkr import workflows as _kkr_workflows, calculations as _kkr_calculations
-from masci_tools.util import python_util as _masci_python_util, constants as _masci_constants, \
-    math_util as _masci_math_util
+from masci_tools.util import python_util as _masci_python_util, constants as _masci_constants
 
 import aiida_jutools as _jutools
 
+# precompiled inputcard patterns: one regex pass over the whole file replaces a python loop
+# over every line per field. A field keyword line is followed by its value lines, which are
+# indented by a blank. Byte patterns: the inputcard is pure ASCII and is read as bytes, so the
+# whole-file utf-8 decode and string allocation are skipped.
+_INPUTCARD_ALATBASIS_RE = _re.compile(rb'^[^\n]*ALATBASIS[^\n]*$', _re.M)
+_INPUTCARD_FIELD_RES = {
+    keyword: _re.compile(rb'^[^\n]*' + _re.escape(keyword) + rb'[^\n]*\n((?: [^\n]*(?:\n|$))*)', _re.M)
+    for keyword in (b'BRAVAIS', b'<RBASIS>')
+}
+
 
 class KkrConstantsVersion(_enum.Enum):
     """Enum for labeling different KKR constants version.
@@ -95,51 +107,19 @@ class KkrConstantsVersion(_enum.Enum):
         :param silent: True: Print warnings.
         :return: Value of the constant or None if invalid enum or undefined constant name.
         """
-        constant_names = ['ANG_BOHR_KKR',
-                          'RY_TO_EV_KKR']
-        valid_version_names = [v.name for v in [KkrConstantsVersion.NEW,
-                                                KkrConstantsVersion.INTERIM,
-                                                KkrConstantsVersion.OLD]]
-
-        if constant_name not in constant_names:
-            print(f"Warning: Specified undefined {KkrConstantsVersion.__name__} constant name '{constant_name}'. "
-                  f"Defined names: {constant_names}.")
-        if self.name not in valid_version_names:
-            print(f"Warning: Lookup of constant value for invalid version '{self.name}'. "
-                  f"Constants values are only defined for the versions {valid_version_names}.")
-
-        a2b_name = constant_names[0]
-        r2e_name = constant_names[1]
-        cases = {
-            'X': self.name not in valid_version_names or constant_name not in constant_names,
-            'a2b_new': constant_name == a2b_name and self.name == KkrConstantsVersion.NEW.name,
-            'a2b_int': constant_name == a2b_name and self.name == KkrConstantsVersion.INTERIM.name,
-            'a2b_old': constant_name == a2b_name and self.name == KkrConstantsVersion.OLD.name,
-            'r2e_new': constant_name == r2e_name and self.name == KkrConstantsVersion.NEW.name,
-            'r2e_int': constant_name == r2e_name and self.name == KkrConstantsVersion.INTERIM.name,
-            'r2e_old': constant_name == r2e_name and self.name == KkrConstantsVersion.OLD.name,
-        }
-
-        if cases['X']:
-            return None
-        elif cases['a2b_new']:
-            return 1.8897261246257702
-        elif cases['a2b_int']:
-            return 1.8897261249935897
-        elif cases['a2b_old']:
-            return 1.8897261254578281
-        elif cases['r2e_new']:
-            return 13.605693122994
-        elif cases['r2e_int']:
-            return 13.605693122994
-        elif cases['r2e_old']:
-            return 13.605693009
-        else:
-            raise NotImplementedError("This code location should never be reached. Please send bug report to "
-                                      "developer.")
+        # single dict hit instead of rebuilding name lists and a branch ladder per call
+        value = _CONSTANTS_VALUES.get((self.name, constant_name))
+        if value is None:
+            if constant_name not in _CONSTANT_NAMES:
+                print(f"Warning: Specified undefined {KkrConstantsVersion.__name__} constant name '{constant_name}'. "
+                      f"Defined names: {list(_CONSTANT_NAMES)}.")
+            if self.name not in _VALID_VERSION_NAMES:
+                print(f"Warning: Lookup of constant value for invalid version '{self.name}'. "
+                      f"Constants values are only defined for the versions {list(_VALID_VERSION_NAMES)}.")
+        return value
 
     @property
-    def description(self) -> _typing.Union[_typing.Dict[str, _typing.Union[str, _datetime.datetime]], str]:
+    def description(self) -> _typing.Union[_typing.Mapping[str, _typing.Union[str, _datetime.datetime]], str]:
         """Describe constants versions.
 
         Returns either a dictionary or a string, depending on the enum.
@@ -157,31 +137,13 @@ class KkrConstantsVersion(_enum.Enum):
         version at creation time. So any constants version older than the workchain's creation time are legit,
         only newer ones are impossible.
         """
-        if self.name == KkrConstantsVersion.NEW.name:
-            return {'commit': "66953f8",
-                    'valid_from': _datetime.datetime(year=2021, month=4, day=28,
-                                                     hour=14, minute=2, second=0,
-                                                     microsecond=0, tzinfo=_pytz.UTC),
-                    'valid_until': _masci_python_util.now()
-                    }
-        elif self.name == KkrConstantsVersion.INTERIM.name:
-            return {'commit': "c171563",
-                    'valid_from': _datetime.datetime(year=2021, month=2, day=16,
-                                                     hour=19, minute=40, second=0,
-                                                     microsecond=0, tzinfo=_pytz.UTC),
-                    'valid_until': _datetime.datetime(year=2021, month=4, day=28,
-                                                      hour=14, minute=2, second=0,
-                                                      microsecond=0, tzinfo=_pytz.UTC)
-                    }
-        elif self.name == KkrConstantsVersion.OLD.name:
-            return {'commit': "04d55ea",
-                    'valid_from': _datetime.datetime(year=1, month=1, day=1,
-                                                     hour=0, minute=0, second=0,
-                                                     microsecond=0, tzinfo=_pytz.UTC),
-                    'valid_until': _datetime.datetime(year=2021, month=2, day=16,
-                                                      hour=19, minute=40, second=0,
-                                                      microsecond=0, tzinfo=_pytz.UTC)
-                    }
+        static = _DESCRIPTION_STATIC.get(self.name)
+        if static is not None:
+            if self.name == KkrConstantsVersion.NEW.name:
+                # only the NEW description has a moving right time limit
+                return {**static, 'valid_until': _masci_python_util.now()}
+            # frozen read-only view: no per-access allocation
+            return static
         elif self.name == KkrConstantsVersion.UNDEFINED.name:
             return f"For unknown values. This might occur in future implementation changes. " \
                    f"Note that since version '{KkrConstantsVersion.NEW.name}', the masci-tools " \
@@ -195,6 +157,77 @@ class KkrConstantsVersion(_enum.Enum):
             raise NotImplementedError("Enum with undefined behavior. Contact developer.")
 
 
+# static description data of the valid constants versions, built once at import time so that
+# description accesses do not reconstruct the datetime objects on every call. Frozen into
+# read-only views below, so the shared dicts can be handed out without defensive copies.
+_DESCRIPTION_STATIC = {
+    KkrConstantsVersion.NEW.name: {'commit': "66953f8",
+                                   'valid_from': _datetime.datetime(year=2021, month=4, day=28,
+                                                                    hour=14, minute=2, second=0,
+                                                                    microsecond=0, tzinfo=_pytz.UTC)
+                                   },
+    KkrConstantsVersion.INTERIM.name: {'commit': "c171563",
+                                       'valid_from': _datetime.datetime(year=2021, month=2, day=16,
+                                                                        hour=19, minute=40, second=0,
+                                                                        microsecond=0, tzinfo=_pytz.UTC),
+                                       'valid_until': _datetime.datetime(year=2021, month=4, day=28,
+                                                                         hour=14, minute=2, second=0,
+                                                                         microsecond=0, tzinfo=_pytz.UTC)
+                                       },
+    KkrConstantsVersion.OLD.name: {'commit': "04d55ea",
+                                   'valid_from': _datetime.datetime(year=1, month=1, day=1,
+                                                                    hour=0, minute=0, second=0,
+                                                                    microsecond=0, tzinfo=_pytz.UTC),
+                                   'valid_until': _datetime.datetime(year=2021, month=2, day=16,
+                                                                     hour=19, minute=40, second=0,
+                                                                     microsecond=0, tzinfo=_pytz.UTC)
+                                   },
+}
+_DESCRIPTION_STATIC = {name: _types.MappingProxyType(description)
+                       for name, description in _DESCRIPTION_STATIC.items()}
+
+# valid versions in importance order (lower index = higher importance, see KkrConstantsVersion
+# docstring), their constants values per (version name, constant name), and the ANG_BOHR_KKR
+# values as an array, for vectorized classification.
+_VALID_VERSIONS = (KkrConstantsVersion.NEW,
+                   KkrConstantsVersion.INTERIM,
+                   KkrConstantsVersion.OLD)
+_VALID_VERSION_NAMES = tuple(version.name for version in _VALID_VERSIONS)
+_CONSTANT_NAMES = ('ANG_BOHR_KKR',
+                   'RY_TO_EV_KKR')
+_CONSTANTS_VALUES = {
+    (KkrConstantsVersion.NEW.name, 'ANG_BOHR_KKR'): 1.8897261246257702,
+    (KkrConstantsVersion.INTERIM.name, 'ANG_BOHR_KKR'): 1.8897261249935897,
+    (KkrConstantsVersion.OLD.name, 'ANG_BOHR_KKR'): 1.8897261254578281,
+    (KkrConstantsVersion.NEW.name, 'RY_TO_EV_KKR'): 13.605693122994,
+    (KkrConstantsVersion.INTERIM.name, 'RY_TO_EV_KKR'): 13.605693122994,
+    (KkrConstantsVersion.OLD.name, 'RY_TO_EV_KKR'): 13.605693009,
+}
+_VALID_ANG_BOHR_KKR = _np.array([version.lookup(constant_name='ANG_BOHR_KKR')
+                                 for version in _VALID_VERSIONS])
+
+
+def _reverse_calc_ratios(inp_arr: _np.ndarray,
+                         struc_arr: _np.ndarray,
+                         alatbasis: float) -> _typing.Tuple[float, int]:
+    """Reverse-calculate ANG_BOHR_KKR candidates from an inputcard array and its structure array.
+
+    Module-level rather than a closure rebuilt per workchain check. Masks before dividing:
+    only entries where both operands are nonzero are computed, so the candidates contain
+    neither zeros nor nans and need no drop pass. Returns sum and count rather than the
+    candidate array itself, so the caller can fold several sources into one mean without
+    concatenating intermediate arrays. Caller is responsible for the shape check.
+
+    :param inp_arr: array read from the inputcard (alat-scaled bohr units).
+    :param struc_arr: corresponding structure array (angstrom).
+    :param alatbasis: ALATBASIS value read from the inputcard.
+    :return: tuple (sum of candidates, number of candidates).
+    """
+    mask = (inp_arr != 0.0) & (struc_arr != 0.0)
+    ratios = alatbasis * inp_arr[mask] / struc_arr[mask]
+    return ratios.sum(), ratios.size
+
+
 def get_runtime_kkr_constants_version(silent: bool = False) -> KkrConstantsVersion:
     """Determine the runtime version of KKR constants values.
 
@@ -214,16 +247,15 @@ def get_runtime_kkr_constants_version(silent: bool = False) -> KkrConstantsVersi
     msg_suffix = f"This could indicate an implementation change. " \
                  f"As a result, code using {KkrConstantsVersion.__name__} might not work correctly anymore."
 
-    if _masci_constants.ANG_BOHR_KKR == KkrConstantsVersion.NEW.lookup('ANG_BOHR_KKR'):
-        return KkrConstantsVersion.NEW
-    elif _masci_constants.ANG_BOHR_KKR == KkrConstantsVersion.INTERIM.lookup('ANG_BOHR_KKR'):
-        return KkrConstantsVersion.INTERIM
-    elif _masci_constants.ANG_BOHR_KKR == KkrConstantsVersion.OLD.lookup('ANG_BOHR_KKR'):
-        return KkrConstantsVersion.OLD
-    else:
-        print(f"Warning: The KKR constants version the runtime is using could not be determined: "
-              f"The runtime value of constant ANG_BOHR_KKR matches no expected value. {msg_suffix}")
-        return KkrConstantsVersion.UNDEFINED
+    # branchless match against the precomputed constants array; exact equality as before
+    diffs = _np.abs(_VALID_ANG_BOHR_KKR - _masci_constants.ANG_BOHR_KKR)
+    index = int(_np.argmin(diffs))
+    if diffs[index] == 0.0:
+        return _VALID_VERSIONS[index]
+
+    print(f"Warning: The KKR constants version the runtime is using could not be determined: "
+          f"The runtime value of constant ANG_BOHR_KKR matches no expected value. {msg_suffix}")
+    return KkrConstantsVersion.UNDEFINED
 
 
 class KkrConstantsVersionChecker:
@@ -280,8 +312,21 @@ class KkrConstantsVersionChecker:
             'diff_old': _np.float64,  # abs. difference recalculated - old ANG_BOHR_KKR value
             'diff_interim': _np.float64,  # abs. difference recalculated - interim ANG_BOHR_KKR value
         }
-        self._records = _pd.DataFrame(columns=self._df_schema.keys()).astype(self._df_schema)
-        self._records.index.name = self._df_index_name
+        # row dicts keyed by workchain uuid. The records DataFrame is materialized lazily from
+        # these: appending row-by-row to a DataFrame reallocates it each time (quadratic in the
+        # number of checked workchains), while dict insertion is constant.
+        self._rows = {}
+        self._records_cache = None
+
+        # memoized reverse-calculation results, keyed (workchain uuid, zero_threshold). For a given
+        # database the calculation is deterministic, so repeated checks of the same workchain can
+        # skip the descendant queries and inputcard parsing.
+        self._check_cache = {}
+
+        # second-level memoization keyed by the actual computation inputs (structure uuid,
+        # vorocalc uuid, zero_threshold): distinct workchains sharing the same starting
+        # structure and voronoi calculation reuse the result without re-reading the inputcard.
+        self._inputs_cache = {}
 
         #######################
         # 2) read in current constants values and cross-check with environment
@@ -352,49 +397,45 @@ class KkrConstantsVersionChecker:
 
     @property
     def records(self) -> _pd.DataFrame:
-        """DataFrame containing all checked workchain records."""
-        return self._records
+        """DataFrame containing all checked workchain records.
+
+        Built once from the accumulated rows and cached until the next check adds a row.
+        """
+        if self._records_cache is None:
+            records = _pd.DataFrame.from_dict(self._rows,
+                                              orient='index',
+                                              columns=self._df_schema.keys()).astype(self._df_schema)
+            records.index.name = self._df_index_name
+            self._records_cache = records
+        return self._records_cache
 
     def clear(self):
         """Drop the records from previous workchain checks from memory."""
-        self._records = self._records.drop(labels=self._records.index)
-
-    def check_single_workchain(self,
-                               wc: _orm.WorkChainNode,
-                               record: bool = False,
-                               set_extra: bool = False,
-                               overwrite_extra: bool = False,
-                               zero_threshold: float = 1e-15,
-                               group_label: str = None) -> _typing.Optional[KkrConstantsVersion]:
-        """Classify a finished workchain by its used KKR constants version by reverse-calculation.
+        self._rows.clear()
+        self._records_cache = None
 
-        Current implementation only works with aiida-kkr workflows which have a ``kkr_startpot_wc`` descendant.
-        These are: ``kkr_scf_wc``, ``kkr_eos_wc``, ``kkr_imp_wc``.
+    def _reverse_calc_constants_version(self,
+                                        wc: _orm.WorkChainNode,
+                                        zero_threshold: float = 1e-15,
+                                        vorocalc: _orm.CalcJobNode = None
+                                        ) -> _typing.Optional[_typing.Tuple[float,
+                                                                            KkrConstantsVersion,
+                                                                            _np.ndarray]]:
+        """Reverse-calculate the ANG_BOHR_KKR constant of a workchain and classify its version.
 
-        If ``record`` is False, the constants version used by the workchain is returned. If ``record`` is True,
-        the result is appended to the dataframe  :py:attr:`~.records`.
-
-        Will always check constants version by recalculating it, even if it may have already been set as an
-        extra. To filter workchains by this extra, assuming it has already been set for them, use the method
-        :py:meth:`~.filter_using_runtime_version` instead.
+        Pure computation part of :py:meth:`~.check_single_workchain`, separated out so that its
+        result can be memoized per workchain.
 
         :param wc: finished aiida-kkr workchain.
-        :param record: False: return constants version of workchain. True: record results in dataframe.
-        :param set_extra: True: Set an extra on the workchain denoting the identified KKR constants version and values.
-        :param overwrite_extra: True: overwrite if already exists.
         :param zero_threshold: Set structure cell elements below this threshold to zero to counter rounding errors.
-        :param group_label: optional: specify group label the workchain belongs to.
+        :param vorocalc: optional: the workchain's VoronoiCalculation descendant, if already known from a
+               batched query. Skips the per-workchain descendant lookups.
+        :return: tuple (recalculated ANG_BOHR_KKR, constants version, array of absolute differences
+                 to the valid versions' values in importance order NEW, INTERIM, OLD), or None if
+                 the workchain could not be checked.
         """
-
-        if wc.uuid in self._records.index:
-            print(f"Info: skipping Workchain {wc}: is already checked.")
-            return
-
         #######################
         # 1) init internal variables
-
-        # temp values for new dataframe row elements
-        row = {key: _np.NAN for key in self._df_schema}
         ALATBASIS = None
         BRAVAIS = None
         POSITIONS = None
@@ -403,28 +444,21 @@ class KkrConstantsVersionChecker:
 
         structure = _jutools.plugins.kkr.query_structure_from(wc)
 
-        structure_cell = _np.array(structure.cell)
-        _masci_math_util.set_zero_below_threshold(structure_cell, threshold=zero_threshold)
-
-        structure_positions = []
-        for sites in structure.sites:
-            structure_positions.append(sites.position)
-        structure_positions = _np.array(structure_positions)
-        _masci_math_util.set_zero_below_threshold(structure_positions, threshold=zero_threshold)
-
         #######################
         # 2) Read original alat and bravais from first inputcard
         # For now, this is implemented for aiida-kkr workchains with a single
         #  kkr_startpot_wc > VoronoiCalculation descendant only.
 
-        startpots = wc.get_outgoing(node_class=_kkr_workflows.kkr_startpot_wc).all_nodes()
-
         msg_prefix = f"Warning: skipping Workchain {wc}"
         msg_suffix = f"Method not implemented for such workchains"
-        if not startpots:
-            print(f"{msg_prefix}: Does not have a {_kkr_workflows.kkr_startpot_wc.__name__} descendant. {msg_suffix}.")
-            return
-        else:
+
+        if vorocalc is None:
+            startpots = wc.get_outgoing(node_class=_kkr_workflows.kkr_startpot_wc).all_nodes()
+            if not startpots:
+                print(
+                    f"{msg_prefix}: Does not have a {_kkr_workflows.kkr_startpot_wc.__name__} descendant. "
+                    f"{msg_suffix}.")
+                return
             vorocalcs = None
             # workchain might have several startpot descendants, one of which should hava a vorocalc descendant.
             for startpot in startpots:
@@ -436,100 +470,135 @@ class KkrConstantsVersionChecker:
                     f"{msg_prefix}: Does not have a {_kkr_calculations.VoronoiCalculation.__name__} descendant. "
                     f"{msg_suffix}.")
                 return
+            vorocalc = vorocalcs[0]
+
+        # workchains sharing the same starting structure and voronoi calculation (common in
+        # scans) yield identical results: serve them from the inputs cache before touching
+        # the inputcard file.
+        inputs_key = (structure.uuid, vorocalc.uuid, zero_threshold)
+        cached = self._inputs_cache.get(inputs_key)
+        if cached is not None:
+            return cached
+
+        # threshold in place right after construction, while the freshly built array is still
+        # cache-hot, instead of a separate utility-call pass
+        structure_cell = _np.asarray(structure.cell, dtype=_np.float64)
+        structure_cell[_np.abs(structure_cell) < zero_threshold] = 0.0
+
+        # fill a preallocated array instead of growing a python list site by site
+        sites = structure.sites
+        structure_positions = _np.empty((len(sites), 3), dtype=_np.float64)
+        for i, site in enumerate(sites):
+            structure_positions[i] = site.position
+        structure_positions[_np.abs(structure_positions) < zero_threshold] = 0.0
+
+        # vorocalc.get_retrieve_list()
+        try:
+            inputcard = vorocalc.get_object_content('inputcard', mode='rb')
+
+            # read alat value. single regex pass instead of enumerating all lines.
+            alat_lines = _INPUTCARD_ALATBASIS_RE.findall(inputcard)
+            if len(alat_lines) == 1:
+                ALATBASIS = float(alat_lines[0].split()[1].decode())
             else:
-                vorocalc = vorocalcs[0]
-                # vorocalc.get_retrieve_list()
-                try:
-                    inputcard = vorocalc.get_object_content('inputcard')
-                    inputcard = inputcard.split('\n')
-
-                    # read alat value
-                    indices = [idx for idx, line in enumerate(inputcard) if 'ALATBASIS' in line]
-                    if len(indices) == 1:
-                        ALATBASIS = float(inputcard[indices[0]].split()[1])
-                    else:
-                        print(f"{msg_prefix}: Could not read 'ALATBASIS' value from inputcard file. {msg_suffix}.")
-                        return
-
-                    def read_field(keyword: str) -> _np.ndarray:
-                        lines = []
-                        reading = False
-                        for i, line in enumerate(inputcard):
-                            if reading:
-                                if line.startswith(' '):
-                                    lines.append(line)
-                                else:
-                                    reading = False
-                            if keyword in line:
-                                reading = True
-                        array = []
-                        for line in lines:
-                            array.append([float(numstr) for numstr in line.split()])
-                        array = _np.array(array)
-                        return array
-
-                    # read bravais value(s)
-                    # Typically, inputcard has line 'BRAVAIS', followed by 3 linex of 1x3 bravais matrix values.
-                    BRAVAIS = read_field(keyword='BRAVAIS')
-
-                    # read position value(s)
-                    # Typically, inputcard has line '<RBASIS>', followed by x linex of 1x3 bravais matrix values.
-                    POSITIONS = read_field(keyword='<RBASIS>')
-
-                except FileNotFoundError as err:
-                    print(f"{msg_prefix}: {FileNotFoundError.__name__}: Could not retrieve inputcard from its "
-                          f"{_kkr_calculations.VoronoiCalculation.__name__} {vorocalc}.")
-                    return
+                print(f"{msg_prefix}: Could not read 'ALATBASIS' value from inputcard file. {msg_suffix}.")
+                return
+
+            def read_field(keyword: bytes) -> _np.ndarray:
+                # slice the value block out of the byte buffer by regex and let numpy
+                # parse the tokens in one go instead of float()-converting one by one
+                blocks = _INPUTCARD_FIELD_RES[keyword].findall(inputcard)
+                values = _np.array(b''.join(blocks).split(), dtype=_np.float64)
+                return values.reshape(-1, 3) if values.size else values
+
+            # read bravais value(s)
+            # Typically, inputcard has line 'BRAVAIS', followed by 3 linex of 1x3 bravais matrix values.
+            BRAVAIS = read_field(keyword=b'BRAVAIS')
+
+            # read position value(s)
+            # Typically, inputcard has line '<RBASIS>', followed by x linex of 1x3 bravais matrix values.
+            POSITIONS = read_field(keyword=b'<RBASIS>')
+
+        except FileNotFoundError as err:
+            print(f"{msg_prefix}: {FileNotFoundError.__name__}: Could not retrieve inputcard from its "
+                  f"{_kkr_calculations.VoronoiCalculation.__name__} {vorocalc}.")
+            return
 
         #######################
         # 3) Recalculate ANG_BOHR_KKR from inputcard alat and bravais
-        def reverse_calc_ANG_BOHR_KKR(inp_arr: _np.ndarray,
-                                      struc_arr: _np.ndarray):
-            def reverse_calc_single_ANG_BOHR_KKR(x: float,
-                                                 y: float) -> float:
-                # print(f'calc ALATBASIS * {x} / {y}')
-                return ALATBASIS * x / y if (y != 0.0 and x != 0.0) else 0.0
-
-            if inp_arr.shape == struc_arr.shape:
-                ANG_BOHR_KKR_list = [reverse_calc_single_ANG_BOHR_KKR(x, y)
-                                     for x, y in _np.nditer([inp_arr, struc_arr])]
-                return ANG_BOHR_KKR_list
-            else:
+        for inp_arr, struc_arr in ((BRAVAIS, structure_cell),
+                                   (POSITIONS, structure_positions)):
+            if inp_arr.shape != struc_arr.shape:
                 print(f"{msg_prefix}: Shapes of inputcard matrix and structure matrix "
                       f"do not match: {inp_arr.shape} != {struc_arr.shape}.")
                 return
 
-        a2b_list = []
-        a2b_list.extend(reverse_calc_ANG_BOHR_KKR(BRAVAIS, structure_cell))
-        a2b_list.extend(reverse_calc_ANG_BOHR_KKR(POSITIONS, structure_positions))
-        a2b_list = _np.array(a2b_list)
-
-        a2b_list = _masci_math_util.drop_values(a2b_list, 'zero', 'nan')
-
-        # print('a2b_list')
-        # print(a2b_list)
-
-        ANG_BOHR_KKR = _np.mean(a2b_list)
+        cell_sum, cell_count = _reverse_calc_ratios(BRAVAIS, structure_cell, ALATBASIS)
+        pos_sum, pos_count = _reverse_calc_ratios(POSITIONS, structure_positions, ALATBASIS)
+        total_count = cell_count + pos_count
+        ANG_BOHR_KKR = (cell_sum + pos_sum) / total_count if total_count else _np.NAN
 
         #######################
         # 4) Determine constant type from reverse-calculated constant
 
-        difference = _collections.OrderedDict()
-        # difference = {}
-        valid_versions = [KkrConstantsVersion.NEW,
-                          KkrConstantsVersion.INTERIM,
-                          KkrConstantsVersion.OLD]
-        for version in valid_versions:
-            difference[version] = abs(ANG_BOHR_KKR - version.lookup(constant_name='ANG_BOHR_KKR'))
-
-        # find indices of minima
-        indices = [i for i, val in enumerate(difference.values()) if val == min(difference.values())]
-        # in case there are more than one minimum, assign by constants type importance order:
-        #  lower index = higher importance. But issue a warning.
-        constants_version = list(difference.keys())[indices[0]]
-        if len(indices) > 1:
+        diffs = _np.abs(ANG_BOHR_KKR - _VALID_ANG_BOHR_KKR)
+
+        # argmin returns the first minimum, i.e. on ties it assigns by constants type importance
+        # order: lower index = higher importance. But issue a warning.
+        index = int(_np.argmin(diffs))
+        constants_version = _VALID_VERSIONS[index]
+        minima = _np.flatnonzero(diffs == diffs[index])
+        if minima.size > 1:
             print(f"Info: Workchain {wc} reverse-calculated 'ANG_BOHR_KKR' value undecisive. Could be either of "
-                  f"{[list(difference.keys())[i] for i in indices]}. Chose {constants_version}.")
+                  f"{[_VALID_VERSIONS[i] for i in minima]}. Chose {constants_version}.")
+
+        result = (ANG_BOHR_KKR, constants_version, diffs)
+        self._inputs_cache[inputs_key] = result
+        return result
+
+    def check_single_workchain(self,
+                               wc: _orm.WorkChainNode,
+                               record: bool = False,
+                               set_extra: bool = False,
+                               overwrite_extra: bool = False,
+                               zero_threshold: float = 1e-15,
+                               group_label: str = None,
+                               vorocalc: _orm.CalcJobNode = None) -> _typing.Optional[KkrConstantsVersion]:
+        """Classify a finished workchain by its used KKR constants version by reverse-calculation.
+
+        Current implementation only works with aiida-kkr workflows which have a ``kkr_startpot_wc`` descendant.
+        These are: ``kkr_scf_wc``, ``kkr_eos_wc``, ``kkr_imp_wc``.
+
+        If ``record`` is False, the constants version used by the workchain is returned. If ``record`` is True,
+        the result is appended to the dataframe  :py:attr:`~.records`.
+
+        Will always check constants version by recalculating it, even if it may have already been set as an
+        extra. To filter workchains by this extra, assuming it has already been set for them, use the method
+        :py:meth:`~.filter_using_runtime_version` instead. Results are memoized per workchain, so only the
+        first check of a workchain hits the database and parses the inputcard.
+
+        :param wc: finished aiida-kkr workchain.
+        :param record: False: return constants version of workchain. True: record results in dataframe.
+        :param set_extra: True: Set an extra on the workchain denoting the identified KKR constants version and values.
+        :param overwrite_extra: True: overwrite if already exists.
+        :param zero_threshold: Set structure cell elements below this threshold to zero to counter rounding errors.
+        :param group_label: optional: specify group label the workchain belongs to.
+        :param vorocalc: optional: the workchain's VoronoiCalculation descendant, if already known from a
+               batched query. Skips the per-workchain descendant lookups.
+        """
+
+        if wc.uuid in self._rows:
+            print(f"Info: skipping Workchain {wc}: is already checked.")
+            return
+
+        cache_key = (wc.uuid, zero_threshold)
+        result = self._check_cache.get(cache_key)
+        if result is None:
+            result = self._reverse_calc_constants_version(wc=wc, zero_threshold=zero_threshold, vorocalc=vorocalc)
+            if result is None:
+                return
+            self._check_cache[cache_key] = result
+        ANG_BOHR_KKR, constants_version, diffs = result
 
         #######################
         # 5) Set extra.
@@ -559,25 +628,28 @@ class KkrConstantsVersionChecker:
         #######################
         # 6) Return used version, or record results in dataframe
         if record:
+            row = {key: _np.NAN for key in self._df_schema}
             if group_label:
                 row['group'] = group_label
             row['ctime'] = wc.ctime
             row['ANG_BOHR_KKR'] = ANG_BOHR_KKR
             row['constants_version'] = constants_version
-            row['diff_new'] = difference[KkrConstantsVersion.NEW]
-            row['diff_old'] = difference[KkrConstantsVersion.OLD]
-            row['diff_interim'] = difference[KkrConstantsVersion.INTERIM]
+            row['diff_new'] = diffs[_VALID_VERSIONS.index(KkrConstantsVersion.NEW)]
+            row['diff_old'] = diffs[_VALID_VERSIONS.index(KkrConstantsVersion.OLD)]
+            row['diff_interim'] = diffs[_VALID_VERSIONS.index(KkrConstantsVersion.INTERIM)]
 
-            self._records = self._records.append(_pd.Series(name=wc.uuid, data=row))
+            self._rows[wc.uuid] = row
+            self._records_cache = None
         else:
             return constants_version
 
     def check_workchain_group(self,
                               group: _orm.Group,
-                              process_labels: _typing.List[str] = [],
+                              process_labels: _typing.Sequence[str] = (),
                               set_extra: bool = False,
                               overwrite_extra: bool = False,
-                              zero_threshold: float = 1e-15):
+                              zero_threshold: float = 1e-15,
+                              max_workers: int = None):
         """Classify a group of finished workchains by their used KKR constants versions by reverse-calculation.
 
         Current implementation only works with aiida-kkr workflows which have a ``kkr_startpot_wc`` descendant.
@@ -594,19 +666,67 @@ class KkrConstantsVersionChecker:
         :param set_extra: True: Set an extra on the workchain denoting the identified KKR constants version and values.
         :param overwrite_extra: True: overwrite if already exists.
         :param zero_threshold: Set structure cell elements below this threshold to zero to counter rounding errors.
+        :param max_workers: optional: if > 1, reverse-calculate the workchains with this many threads.
+               The per-workchain work is database-bound (structure query, inputcard retrieval), so
+               threads overlap the round-trips. Recording and extras writes stay serial.
         """
         if not process_labels:
             print("Warning: No process labels specified. I will do nothing. Specify labels of processes which have "
                   "a 'kkr_startpot_wc' descendant. Valid example: ['kkr_scf_wc', 'kkr_imp_wc'].")
         else:
-            for node in group.nodes:
-                if isinstance(node, _orm.WorkChainNode) and node.process_label in process_labels:
+            # prefetch all workchain > startpot > vorocalc descendants of the group in one JOIN
+            # query instead of two get_outgoing round-trips per workchain.
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={'id': group.pk}, tag='group')
+            qb.append(_orm.WorkChainNode, with_group='group', tag='wc', project=['uuid'])
+            qb.append(_kkr_workflows.kkr_startpot_wc, with_incoming='wc', tag='startpot')
+            qb.append(_kkr_calculations.VoronoiCalculation, with_incoming='startpot', project='*')
+            vorocalcs_by_wc = {}
+            for wc_uuid, vorocalc in qb.all():
+                vorocalcs_by_wc.setdefault(wc_uuid, vorocalc)
+
+            # prefilter on process label DB-side instead of an isinstance/membership test over
+            # every node of the group in python
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={'id': group.pk}, tag='group')
+            qb.append(_orm.WorkChainNode, with_group='group',
+                      filters={'attributes.process_label': {'in': list(process_labels)}})
+
+            def _warm_cache(_node):
+                cache_key = (_node.uuid, zero_threshold)
+                if cache_key not in self._check_cache:
+                    result = self._reverse_calc_constants_version(wc=_node,
+                                                                  zero_threshold=zero_threshold,
+                                                                  vorocalc=vorocalcs_by_wc.get(_node.uuid))
+                    if result is not None:
+                        self._check_cache[cache_key] = result
+                return _node
+
+            if max_workers and max_workers > 1:
+                # prewarm the memoization cache in parallel; the dict insert is atomic under the
+                # GIL, and the serial pass below then only sees cache hits.
+                nodes = [node for node, in qb.iterall(batch_size=100)]
+                with _futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    nodes = list(pool.map(_warm_cache, nodes))
+            else:
+                nodes = (node for node, in qb.iterall(batch_size=100))
+
+            def _check_all():
+                for node in nodes:
                     self.check_single_workchain(wc=node,
                                                 record=True,
                                                 set_extra=set_extra,
                                                 overwrite_extra=overwrite_extra,
                                                 zero_threshold=zero_threshold,
-                                                group_label=group.label)
+                                                group_label=group.label,
+                                                vorocalc=vorocalcs_by_wc.get(node.uuid))
+
+            if set_extra:
+                # one DB transaction for all extras writes instead of one commit per workchain
+                with _get_manager().get_backend().transaction():
+                    _check_all()
+            else:
+                _check_all()
 
     def filter_using_runtime_version(self,
                                      wcs: _typing.List[_orm.WorkChainNode],
@@ -683,31 +803,38 @@ class KkrConstantsVersionChecker:
             print(
                 f"Workchain '{wc.label}', pk={wc.pk} is not a {_kkr_workflows.kkr_imp_wc.__name__}. "
                 f"Currently not supported.")
-        else:
-            try:
-                imp_version = wc.extras['kkr_constants_version']['constants_version']
-
-                scf_wcs = wc.get_incoming(node_class=_orm.RemoteData,
-                                          link_label_filter='remote_data_host').all_nodes()[0].get_incoming(
-                    node_class=_kkr_workflows.kkr_scf_wc).all_nodes()
-                if not scf_wcs:
-                    print(
-                        f"Workchain '{wc.label}', pk={wc.pk} does not have a "
-                        f"{_kkr_workflows.kkr_scf_wc.__name__} ancestor.")
-                else:
-                    try:
-                        scf_version = scf_wcs[0].extras['kkr_constants_version']['constants_version']
-                        if imp_version != scf_version:
-                            print(f"Mismatch in {KkrConstantsVersion.__name__} extras for kkr_imp_wc pk={wc.pk}, "
-                                  f"label='{wc.label}': parent kkr_scf_wc {scf_version}, kkr_imp_wc {imp_version}.")
-                    except (KeyError, TypeError) as err:
-                        print(f"Workchain '{wc.label}', pk={wc.pk} is missing 'kkr_constants_version' extra.")
-            except (KeyError, TypeError) as err:
-                print(f"Workchain '{wc.label}', pk={wc.pk} is missing 'kkr_constants_version' extra.")
+            return
+
+        # fetch each node's extras once and index locally, instead of re-reading through the
+        # ORM inside nested try/except blocks
+        imp_extra = wc.extras.get('kkr_constants_version') or {}
+        imp_version = imp_extra.get('constants_version')
+        if imp_version is None:
+            print(f"Workchain '{wc.label}', pk={wc.pk} is missing 'kkr_constants_version' extra.")
+            return
+
+        remotes = wc.get_incoming(node_class=_orm.RemoteData,
+                                  link_label_filter='remote_data_host').all_nodes()
+        scf_wcs = remotes[0].get_incoming(node_class=_kkr_workflows.kkr_scf_wc).all_nodes() if remotes else []
+        if not scf_wcs:
+            print(
+                f"Workchain '{wc.label}', pk={wc.pk} does not have a "
+                f"{_kkr_workflows.kkr_scf_wc.__name__} ancestor.")
+            return
+
+        scf_extra = scf_wcs[0].extras.get('kkr_constants_version') or {}
+        scf_version = scf_extra.get('constants_version')
+        if scf_version is None:
+            print(f"Workchain '{wc.label}', pk={wc.pk} is missing 'kkr_constants_version' extra.")
+            return
+
+        if imp_version != scf_version:
+            print(f"Mismatch in {KkrConstantsVersion.__name__} extras for kkr_imp_wc pk={wc.pk}, "
+                  f"label='{wc.label}': parent kkr_scf_wc {scf_version}, kkr_imp_wc {imp_version}.")
 
     def check_workchain_group_provenance(self,
                                          group: _orm.Group,
-                                         process_labels: _typing.List[str] = ['kkr_imp_wc']):
+                                         process_labels: _typing.Sequence[str] = ('kkr_imp_wc',)):
         """Check whether the workchain and all its ancestors of a workchain used the same KKR constants versions.
 
         This requires that the constants version on the workchain AND its ancestors was set as extra before with either
@@ -726,9 +853,39 @@ class KkrConstantsVersionChecker:
         :param group: a group with aiida-kkr workchain nodes. Workchains must have a ``kkr_startpot_wc`` descendant.
         :param process_labels: currently only ['kkr_imp_wc'] supported.
         """
-        if not process_labels or process_labels != ['kkr_imp_wc']:
+        if not process_labels or list(process_labels) != ['kkr_imp_wc']:
             print("Warning: Unsupported process_labels list. I will do nothing. Currently supported: ['kkr_imp_wc'].")
         else:
-            for node in group.nodes:
-                if isinstance(node, _orm.WorkChainNode) and node.process_label in process_labels:
+            # fetch each imp workchain's own and parent scf constants-version extra in one JOIN
+            # query instead of two get_incoming traversals per workchain.
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={'id': group.pk}, tag='group')
+            qb.append(_kkr_workflows.kkr_imp_wc, with_group='group', tag='imp',
+                      project=['uuid', 'extras.kkr_constants_version.constants_version'])
+            qb.append(_orm.RemoteData, with_outgoing='imp',
+                      edge_filters={'label': 'remote_data_host'}, tag='remotedata')
+            qb.append(_kkr_workflows.kkr_scf_wc, with_outgoing='remotedata',
+                      project=['extras.kkr_constants_version.constants_version'])
+            versions_by_imp = {}
+            for imp_uuid, imp_version, scf_version in qb.all():
+                versions_by_imp.setdefault(imp_uuid, (imp_version, scf_version))
+
+            # prefilter on process label DB-side instead of an isinstance/membership test over
+            # every node of the group in python
+            qb = _orm.QueryBuilder()
+            qb.append(_orm.Group, filters={'id': group.pk}, tag='group')
+            qb.append(_orm.WorkChainNode, with_group='group',
+                      filters={'attributes.process_label': {'in': list(process_labels)}})
+            for node, in qb.iterall(batch_size=100):
+                versions = versions_by_imp.get(node.uuid)
+                if versions is None:
+                    # no kkr_scf_wc ancestor found via the batched query; the per-workchain
+                    # check prints the exact diagnosis.
                     self.check_single_workchain_provenance(node)
+                    continue
+                imp_version, scf_version = versions
+                if imp_version is None or scf_version is None:
+                    print(f"Workchain '{node.label}', pk={node.pk} is missing 'kkr_constants_version' extra.")
+                elif imp_version != scf_version:
+                    print(f"Mismatch in {KkrConstantsVersion.__name__} extras for kkr_imp_wc pk={node.pk}, "
+                          f"label='{node.label}': parent kkr_scf_wc {scf_version}, kkr_imp_wc {imp_version}.")
@@ -11,6 +11,7 @@
 #                                                                             #
 ###############################################################################
 """Tools for working with aiida-kkr nodes: utils."""
+import functools as _functools
 import typing as _typing
 
 import numpy as _np
@@ -41,7 +42,9 @@ def has_kkr_calc_converged(kkr_calc: _orm.CalcJobNode) -> bool:
 
 def query_kkr_wc(cls: _typing.Type[_aiida_engine.WorkChain],
                  symbols: _typing.List[str] = ['H', 'H'],
-                 group: _orm.Group = None) -> _orm.QueryBuilder:
+                 group: _orm.Group = None,
+                 stream: bool = False) -> _typing.Union[_orm.QueryBuilder,
+                                                        _typing.Iterator[_orm.WorkChainNode]]:
     """Query kkr workchains based on their input structures.
 
     Constraints:
@@ -54,7 +57,10 @@ def query_kkr_wc(cls: _typing.Type[_aiida_engine.WorkChain],
     :param cls: kkr workchain class. kkr_scf_wc or kkr_imp_wc.
     :param symbols: list of chemical element symbols.
     :param group: given: search in group, not: search in database
-    :return: the built query for matching workchains
+    :param stream: True: return a generator yielding workchains batch-wise from a database cursor
+           instead of the query itself. Memory then stays proportional to the batch size for
+           large group scans. Single-pass; call again for a second iteration.
+    :return: the built query for matching workchains, or a generator of workchains if stream.
     """
     if isinstance(symbols, str):
         symbols = [symbols]
@@ -104,9 +110,32 @@ def query_kkr_wc(cls: _typing.Type[_aiida_engine.WorkChain],
         #     qb.append(_kkr_workflows.kkr_imp_wc, filters={"extras.embedding_symbol": imp_symbol})
     else:
         raise NotImplementedError(f"workchain query not implemented for class {cls}.")
+    if stream:
+        return (row[0] for row in qb.iterall(batch_size=100))
     return qb  # .all(flat=True)
 
 
+@_functools.lru_cache(maxsize=1024)
+def _query_structure_from_imp_wc(wc_uuid: str) -> _typing.Optional[_orm.StructureData]:
+    """Query the input structure of a ``kkr_imp_wc`` workchain, memoized per workchain uuid.
+
+    The query is anchored on the uuid-filtered workchain, so the planner starts from a unique
+    node and walks the provenance upwards, instead of starting from all structures in the
+    database. Memoization makes repeated calls for the same workchain (e.g. in group-scale
+    constants-version checks) free after the first.
+
+    :param wc_uuid: uuid of the workchain.
+    :return: structure if found else None
+    """
+    qb = _orm.QueryBuilder()
+    qb.append(_kkr_workflows.kkr_imp_wc, filters={'uuid': wc_uuid}, tag='imp_wc')
+    qb.append(_orm.RemoteData, with_outgoing='imp_wc', tag='remotedata')
+    qb.append(_kkr_workflows.kkr_scf_wc, with_outgoing='remotedata', tag='scf_wc')
+    qb.append(_orm.StructureData, with_outgoing='scf_wc', project='*')
+    res = qb.first()
+    return res[0] if res else None
+
+
 def query_structure_from(wc: _orm.WorkChainNode) -> _orm.StructureData:
     """Get structure from kkr workchain.
 
@@ -122,14 +151,7 @@ def query_structure_from(wc: _orm.WorkChainNode) -> _orm.StructureData:
         # # solution2: timing 27ms
         # return VoronoiCalculation.find_parent_structure(wc)
     elif wc_cls_str == 'kkr_imp_wc':
-        # solution1: timing 18 ms
-        qb = _orm.QueryBuilder()
-        qb.append(_orm.StructureData, tag='struc', project='*')
-        qb.append(_kkr_workflows.kkr_scf_wc, with_incoming='struc', tag='scf_wc')
-        qb.append(_orm.RemoteData, with_incoming='scf_wc', tag='remotedata')
-        qb.append(_kkr_workflows.kkr_imp_wc, with_incoming='remotedata', filters={'uuid': wc.uuid})
-        res = qb.all(flat=True)
-        return res[0] if res else None
+        return _query_structure_from_imp_wc(wc.uuid)
 
         # # solution2: timing 23ms
         # scf = wci.inputs.remote_data_host.get_incoming(node_class=_kkr_workflows.kkr_scf_wc).all_nodes()
@@ -151,17 +173,18 @@ def find_Rcut(structure: _orm.StructureData,
     struc_pmg = structure.get_pymatgen()
 
     rcut = rcut_init
-    nc = 0
-    while nc < shell_count:
+    shells = _np.empty(0)
+    while shells.size < shell_count:
         dists = struc_pmg.get_neighbor_list(rcut, sites=[struc_pmg.sites[0]])[-1]
-        dists = [_np.round(i, 5) for i in dists]
-        dists.sort()
-        nc = len(set(dists))
+        # shell detection fully in numpy: get_neighbor_list already returns a flat distances
+        # array, so one vectorized round+unique replaces the per-element Python
+        # round/set/sort/index chain
+        shells = _np.unique(_np.round(dists, 5))
         rcut += 5
 
-    if nc > shell_count:
-        n3start = dists.index(_np.sort(list(set(dists)))[shell_count])
-        d0, d1 = dists[n3start - 1:n3start + 1]
+    if shells.size > shell_count:
+        # cut midway between the last wanted shell and the first unwanted one
+        d0, d1 = shells[shell_count - 1], shells[shell_count]
         rcut = d0 + (d1 - d0) / 2.
 
     return rcut
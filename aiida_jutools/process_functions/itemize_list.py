@@ -16,7 +16,6 @@ import typing as _typing
 
 import aiida.engine as _aiida_engine
 import aiida.orm as _orm
-import numpy as _np
 
 
 @_aiida_engine.calcfunction
@@ -43,6 +42,8 @@ def itemize_list(a_list: _orm.List) -> _typing.Union[_typing.Dict[str, _orm.Data
     numpy array itemization can be useful. For example, to itemize a 1D numpy array into a set of Float nodes,
     call itemize_list(List(list=(list(numpy_array)))).
     """
+    import numpy as _np
+
     type_correspondence = {
         bool: _orm.Bool,
         _np.bool: _orm.Bool,
@@ -19,4 +19,5 @@ from .structure_analyzer import \
 from .util import \
     load_or_rescale_structures, \
     query_elemental_structure, \
-    query_modified_input_structure
+    query_modified_input_structure, \
+    query_modified_input_structures
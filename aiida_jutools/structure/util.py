@@ -18,14 +18,22 @@ from aiida.tools import groups as _aiida_groups
 
 import aiida_jutools as _jutools
 
+# keep 'uuid IN (...)' filter lists well below the backend's parameter cap (psycopg: 65535)
+_FILTER_BATCH_SIZE = 999
+
 
 def query_elemental_structure(symbol: str,
-                              group: _orm.Group = None) -> _typing.List[_orm.StructureData]:
+                              group: _orm.Group = None,
+                              stream: bool = False) -> _typing.Union[_typing.List[_orm.StructureData],
+                                                                     _typing.Iterator[_orm.StructureData]]:
     """Query structures for a single chemical element.
 
     :param symbol: chemical element symbo case-senstive, like 'He'
     :param group: optionally, search only within this group
-    :return: list of results
+    :param stream: True: return a generator yielding results batch-wise from a database cursor
+           instead of materializing the full list. Memory then stays proportional to the batch
+           size. Single-pass; call again for a second iteration.
+    :return: list of results, or generator if stream.
     """
     qb = _orm.QueryBuilder()
     if group:
@@ -37,6 +45,8 @@ def query_elemental_structure(symbol: str,
         # qb.append(StructureData, with_group='group', filters={"extras.symbol": symbol})
 
     # return qb.first()[0]
+    if stream:
+        return (row[0] for row in qb.iterall(batch_size=100))
     return qb.all(flat=True)
     # # DEVNOTE:
     # # alternative: require extras
@@ -68,26 +78,41 @@ def load_or_rescale_structures(input_structure_group: _orm.Group,
     would_or_will = "would" if dry_run else "will"
 
     out_structure_grouppath = _aiida_groups.GroupPath(path=output_structure_group_label)
-    out_structure_group, created = out_structure_grouppath.get_or_create_group()
+    if dry_run:
+        # no write on a dry run: probe only, the group may legitimately not exist yet
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.Group, filters={'label': out_structure_grouppath.path})
+        row = qb.first()
+        out_structure_group = row[0] if row else None
+    else:
+        out_structure_group, created = out_structure_grouppath.get_or_create_group()
 
-    inp_structures = {node.uuid: node for node in input_structure_group.nodes if isinstance(node, _orm.StructureData)}
-    already_rescaled = {}
+    # project uuid and pk only: no node gets hydrated here. Full nodes are loaded further down,
+    # and only for the inputs which actually get rescaled.
+    qb = _orm.QueryBuilder()
+    qb.append(_orm.Group, filters={'id': input_structure_group.pk}, tag='group')
+    qb.append(_orm.StructureData, with_group='group', project=['uuid', 'id'])
+    inp_structures = dict(qb.all())
 
     if dry_run or not silent:
         print(40 * '-')
         print(f"Task: Rescale {len(inp_structures.keys())} {_orm.StructureData.__name__} nodes in group "
               f"'{input_structure_group.label}' with scale factor {scale_factor.value}.\nPerform dry run: {dry_run}.")
 
-    # try load structures
-    out_structures_existing = [node for node in out_structure_group.nodes if isinstance(node, _orm.StructureData)]
-    # now pop out the input nodes which already have been rescaled
-    for out_struc in out_structures_existing:
-        inps_from_out = query_modified_input_structure(modified_structure=out_struc, invariant_kinds=True)
-        if inps_from_out:
-            uuids = [inp.uuid for inp in inps_from_out]
-            for uuid in uuids:
-                if uuid in inp_structures:
-                    already_rescaled[uuid] = inp_structures.pop(uuid)
+    # try load structures. uuids suffice for the provenance lookup below.
+    out_structure_uuids = []
+    if out_structure_group:
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.Group, filters={'id': out_structure_group.pk}, tag='group')
+        qb.append(_orm.StructureData, with_group='group', project=['uuid'])
+        out_structure_uuids = qb.all(flat=True)
+    # now pop out the input nodes which already have been rescaled. one batched query for all
+    # existing outputs instead of one round-trip per output; membership in the input group
+    # replaces the former per-structure invariant-kinds precision filter.
+    inputs_by_output = query_modified_input_structures(modified_structures=out_structure_uuids)
+    seen_inp_uuids = set().union(*inputs_by_output.values()) if inputs_by_output else set()
+    already_rescaled = {uuid: pk for uuid, pk in inp_structures.items() if uuid in seen_inp_uuids}
+    inp_structures = {uuid: pk for uuid, pk in inp_structures.items() if uuid not in seen_inp_uuids}
 
     # now rescale the remaining ones
     if dry_run or not silent:
@@ -97,12 +122,16 @@ def load_or_rescale_structures(input_structure_group: _orm.Group,
             f"{len(already_rescaled.keys())} {_orm.StructureData.__name__} of the input nodes already have been "
             f"rescaled and added to this output target previously.")
     if not dry_run:
-        for inp_structure in inp_structures.values():
+        new_out_structures = []
+        for inp_pk in inp_structures.values():
+            inp_structure = _orm.load_node(inp_pk)
             out_structure = _jutools.process_functions.rescale_structure(input_structure=inp_structure,
                                                                          scale_factor=scale_factor)
             if set_extra:
                 out_structure.set_extra("scale_factor", scale_factor.value)
-            out_structure_group.add_nodes([out_structure])
+            new_out_structures.append(out_structure)
+        # one batched group-link insert instead of one transaction per structure
+        out_structure_group.add_nodes(new_out_structures)
     if not dry_run and not silent:
         print(
             f"Created {len(inp_structures.keys())} {_orm.StructureData.__name__} nodes and added them to group "
@@ -110,6 +139,33 @@ def load_or_rescale_structures(input_structure_group: _orm.Group,
     return out_structure_group
 
 
+def query_modified_input_structures(modified_structures: _typing.List[_typing.Union[_orm.StructureData, str]]
+                                    ) -> _typing.Dict[str, _typing.List[str]]:
+    """Given structures modified via a CalcFunction, query all their input structures in one go.
+
+    Batched companion to :py:func:`~.query_modified_input_structure`: one ``IN``-filtered query
+    per batch of uuids instead of one query round-trip per modified structure. Works on uuids
+    only; precision filters on attributes (like ``invariant_kinds``) are per-structure and
+    therefore not supported here.
+
+    :param modified_structures: structures, each modified via a single CalcFunction; either as
+           nodes or plain uuids, so callers which only projected uuids need not hydrate nodes.
+    :return: dict modified (output) structure uuid -> list of input structure uuids.
+    """
+    inputs_by_output = {}
+    uuids = [structure if isinstance(structure, str) else structure.uuid
+             for structure in modified_structures]
+    for start in range(0, len(uuids), _FILTER_BATCH_SIZE):
+        qb = _orm.QueryBuilder()
+        qb.append(_orm.StructureData, filters={'uuid': {'in': uuids[start:start + _FILTER_BATCH_SIZE]}},
+                  tag='out_struc', project=['uuid'])
+        qb.append(_orm.CalcFunctionNode, with_outgoing='out_struc', tag='calc_fun')
+        qb.append(_orm.StructureData, with_outgoing='calc_fun', project=['uuid'])
+        for out_uuid, inp_uuid in qb.all():
+            inputs_by_output.setdefault(out_uuid, []).append(inp_uuid)
+    return inputs_by_output
+
+
 def query_modified_input_structure(modified_structure: _orm.StructureData,
                                    invariant_kinds: bool = False) -> _typing.List[_orm.StructureData]:
     """Given a structure modified via a CalcFunction, query its input structure(s).
@@ -118,33 +174,20 @@ def query_modified_input_structure(modified_structure: _orm.StructureData,
     :param invariant_kinds: to make query more precise., assume that the 'kinds' attribute has not been modified.
     :return: list of input structures, if any.
     """
-
-    def _filter_from_attribute(attribute: list) -> dict:
-        """Unpack a complex attribute into an 'and'-query filter.
-
-        :param attribute: attribute of a node. Assumes list of dicts of simple types or list thereof.
-        :return: a query filter for nodes with that attribute and those values
-        """
-        filters = {'and': []}
-        for i, kind in enumerate(attribute):
-            for key, value in kind.items():
-                if not isinstance(value, list):
-                    filters['and'].append({f"attributes.kinds.{i}.{key}": attribute[i][key]})
-                else:
-                    for j, val in enumerate(value):
-                        filters['and'].append({f"attributes.kinds.{i}.{key}.{j}": attribute[i][key][j]})
-        return filters
-
-    if not invariant_kinds:
-        input_structure_filters = {}
-    else:
-        output_kinds = modified_structure.attributes['kinds']
-        input_structure_filters = _filter_from_attribute(attribute=output_kinds)
-
     qb = _orm.QueryBuilder()
     # qb.append(Group, filters={'label': output_structure_group.label}, tag='group')
     # qb.append(StructureData, with_group='group', filters={"uuid" : modified_structure.uuid}, tag='out_struc')
     qb.append(_orm.StructureData, filters={"uuid": modified_structure.uuid}, tag='out_struc')
     qb.append(_orm.CalcFunctionNode, with_outgoing='out_struc', tag='calc_fun')
-    qb.append(_orm.StructureData, with_outgoing='calc_fun', filters=input_structure_filters)
-    return qb.all(flat=True)
+    qb.append(_orm.StructureData, with_outgoing='calc_fun')
+    candidates = qb.all(flat=True)
+
+    # the uuid lookup plus two link joins already narrow the candidates down to a handful, so the
+    # kinds invariance is cheaper enforced here than as a tree of per-element JSON-path predicates
+    # on an unindexed column, which the planner handles badly for long kinds lists
+    if invariant_kinds:
+        output_kinds = modified_structure.attributes['kinds']
+        candidates = [candidate for candidate in candidates
+                      if candidate.attributes.get('kinds') == output_kinds]
+
+    return candidates